@@ -1,17 +1,37 @@
-#!/usr/bin/env -S pixi exec --spec python>=3.11 --spec networkx --spec pydot --spec click --spec graphviz --spec pydantic -- python
+#!/usr/bin/env -S pixi exec --spec python>=3.11 --spec networkx --spec pydot --spec click --spec graphviz --spec pydantic --spec orjson --spec ijson -- python
 
 # ----- IMPORTS -----
 import json
+import fnmatch
+import functools
 import hashlib
+import io
+import re
 import sys
+from collections import Counter, deque
 from pathlib import Path
 import networkx as nx
-import click
-from typing import Dict, List, Tuple, Any, Optional, TypedDict, Literal
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Any,
+    Optional,
+    TypedDict,
+    Literal,
+)
 
 # Pydantic import for dependency graph validation
 from pydantic import BaseModel, Field, field_validator, ConfigDict, ValidationError
 
+# Optional fast JSON parser; falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ----- CONSTANTS AND CONFIGURATION -----
 # CellProfiler setting types
 # Input types
@@ -65,19 +85,64 @@ NODE_TYPE_MEASUREMENT = "measurement"  # dep graph only
 # List types are kept for input/edge classification but don't create separate nodes
 NODE_TYPE_IMAGE_LIST = "image_list"
 NODE_TYPE_OBJECT_LIST = "object_list"
+# Node types that represent data (as opposed to modules)
+DATA_NODE_TYPES = frozenset({NODE_TYPE_IMAGE, NODE_TYPE_OBJECT, NODE_TYPE_MEASUREMENT})
+
+# List input types and the data node type their items are stored as
+LIST_TYPE_TO_BASE_TYPE: Dict[str, str] = {
+    NODE_TYPE_IMAGE_LIST: NODE_TYPE_IMAGE,
+    NODE_TYPE_OBJECT_LIST: NODE_TYPE_OBJECT,
+}
+
+# Setting type dispatch: setting name -> (direction, node type, is comma-separated list)
+SETTING_DISPATCH: Dict[str, Tuple[str, str, bool]] = {
+    name: dispatch
+    for names, dispatch in (
+        (INPUT_IMAGE_TYPES, ("inputs", NODE_TYPE_IMAGE, False)),
+        (INPUT_LABEL_TYPES, ("inputs", NODE_TYPE_OBJECT, False)),
+        (INPUT_IMAGE_LIST_TYPES, ("inputs", NODE_TYPE_IMAGE_LIST, True)),
+        (INPUT_LABEL_LIST_TYPES, ("inputs", NODE_TYPE_OBJECT_LIST, True)),
+        (OUTPUT_IMAGE_TYPES, ("outputs", NODE_TYPE_IMAGE, False)),
+        (OUTPUT_LABEL_TYPES, ("outputs", NODE_TYPE_OBJECT, False)),
+    )
+    for name in names
+}
+
+# Map dependency graph "type" strings to node types; unknown types are ignored
+DEPENDENCY_TYPE_TO_NODE_TYPE: Dict[str, str] = {
+    "image": NODE_TYPE_IMAGE,
+    "object": NODE_TYPE_OBJECT,
+    "measurement": NODE_TYPE_MEASUREMENT,
+}
+
+# Separator for comma-separated list settings, absorbing surrounding whitespace
+LIST_VALUE_SEPARATOR = re.compile(r"\s*,\s*")
 
 # Edge types - match original format exactly for compatibility
 EDGE_TYPE_INPUT = "input"
 EDGE_TYPE_OUTPUT = "output"
 
+# Hash algorithms for stable module IDs (SHA-256 is the default for ID compatibility)
+STABLE_ID_ALGO_SHA256 = "sha256"
+STABLE_ID_ALGO_BLAKE2B = "blake2b"
+STABLE_ID_ALGOS = (STABLE_ID_ALGO_SHA256, STABLE_ID_ALGO_BLAKE2B)
+
 # Rank types for DOT output
 RANK_MIN = "min"
 RANK_MAX = "max"
 
+# DOT identifiers that can be written without quoting (keywords must be quoted)
+DOT_PLAIN_ID = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+DOT_KEYWORDS = frozenset({"strict", "graph", "digraph", "subgraph", "node", "edge"})
+
 # Node ranking configuration
-SOURCE_MODULES = ["LoadData", "NamesAndTypes"]
+SOURCE_MODULES = frozenset({"LoadData", "NamesAndTypes"})
 # Sink nodes: typically terminal modules like SaveImages or Measure*
 SINK_MODULE_PATTERNS = ["SaveImages", "Measure*", "Export*"]
+# All sink patterns combined into one case-sensitive regex
+SINK_MODULE_REGEX = re.compile(
+    "|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in SINK_MODULE_PATTERNS)
+)
 
 # Style constants
 STYLE_COLORS = {
@@ -100,6 +165,16 @@ STYLE_SHAPES = {
 }
 
 
+# Graph writers by output file extension (DOT output is handled separately)
+GRAPH_WRITERS = {
+    ".graphml": nx.write_graphml,
+    ".gexf": nx.write_gexf,
+}
+
+# Buffer size for output files, so writers issue few large write() calls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
 # Type definitions
 class _ModuleInputs(TypedDict):
     """Dictionary of module inputs by data type"""
@@ -147,6 +222,9 @@ class ModuleInfo(TypedDict):
 # Return type for main functions
 GraphData = Tuple[nx.DiGraph, List[ModuleInfo]]
 
+# Pending data connection of a module: (node_id, node_type, name, edge_attrs)
+_PendingConnection = Tuple[str, str, str, Dict[str, str]]
+
 
 # ----- PYDANTIC MODELS FOR DEPENDENCY GRAPH VALIDATION -----
 # These models are used only when validating CP5 dependency graph JSON files
@@ -251,6 +329,62 @@ class DependencyGraph(BaseModel):
 
 
 # ----- PIPELINE PARSING FUNCTIONS -----
+def load_json_file(json_path: str) -> Any:
+    """
+    Load a JSON file with a single read, using orjson when available.
+
+    Args:
+        json_path: Path to the JSON file
+
+    Returns:
+        The parsed JSON data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON (orjson's decode
+            error subclasses it)
+    """
+    data = Path(json_path).read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_file_cached(json_path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Load a JSON file, memoized on its path, modification time and size.
+
+    The modification time and size are only part of the cache key, so an
+    edited file is parsed again.
+    """
+    return load_json_file(json_path)
+
+
+def load_pipeline_json(pipeline_path: str, cache: bool = False) -> Any:
+    """
+    Load a pipeline JSON file, optionally memoizing the parsed data.
+
+    With cache=True, repeated library calls on the same pipeline within one
+    process (e.g. trying several filter combinations) parse it only once; the
+    returned data is then shared between calls and must not be modified.
+
+    Args:
+        pipeline_path: Path to the pipeline JSON file
+        cache: If True, memoize the parsed data on path, modification time and size
+
+    Returns:
+        The parsed pipeline JSON data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    if not cache:
+        return load_json_file(pipeline_path)
+    path = Path(pipeline_path).resolve()
+    stat = path.stat()
+    return _load_json_file_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
 def extract_module_io(module: Dict[str, Any]) -> ModuleInfo:
     """
     Extract inputs and outputs of various data types from a CellProfiler module.
@@ -288,32 +422,27 @@ def extract_module_io(module: Dict[str, Any]) -> ModuleInfo:
 
     # Process each setting in the module
     for setting in module.get("settings", []):
-        setting_name = setting.get("name", "")
-        setting_value = setting.get("value", "")
+        # Look up how this setting type maps to inputs/outputs; most settings
+        # are not I/O, so this is checked before reading the value
+        dispatch = SETTING_DISPATCH.get(setting.get("name"))
+        if dispatch is None:
+            continue
 
         # Skip if value is "None" or empty
+        setting_value = setting.get("value", "")
         if not setting_value or setting_value == "None":
             continue
 
-        # Process input settings
-        if setting_name in INPUT_IMAGE_TYPES:
-            inputs[NODE_TYPE_IMAGE].append(setting_value)
-        elif setting_name in INPUT_LABEL_TYPES:
-            inputs[NODE_TYPE_OBJECT].append(setting_value)
-        elif setting_name in INPUT_IMAGE_LIST_TYPES:
-            # Split comma-separated list and add each item
-            values = [v.strip() for v in setting_value.split(",") if v.strip()]
-            inputs[NODE_TYPE_IMAGE_LIST].extend(values)
-        elif setting_name in INPUT_LABEL_LIST_TYPES:
-            # Split comma-separated list and add each item
-            values = [v.strip() for v in setting_value.split(",") if v.strip()]
-            inputs[NODE_TYPE_OBJECT_LIST].extend(values)
-
-        # Process output settings
-        elif setting_name in OUTPUT_IMAGE_TYPES:
-            outputs[NODE_TYPE_IMAGE].append(setting_value)
-        elif setting_name in OUTPUT_LABEL_TYPES:
-            outputs[NODE_TYPE_OBJECT].append(setting_value)
+        direction, node_type, is_list = dispatch
+        target = (inputs if direction == "inputs" else outputs)[node_type]
+
+        if is_list:
+            # Split comma-separated list and add each non-empty item
+            target.extend(
+                v for v in LIST_VALUE_SEPARATOR.split(setting_value.strip()) if v
+            )
+        else:
+            target.append(setting_value)
 
     # Construct and return the module information
     return {
@@ -361,21 +490,15 @@ def extract_module_io_from_dependency_graph(
 
         # Process inputs
         for input_dep in module_data.inputs:
-            if input_dep.type == "image":
-                inputs[NODE_TYPE_IMAGE].append(input_dep.name)
-            elif input_dep.type == "object":
-                inputs[NODE_TYPE_OBJECT].append(input_dep.name)
-            elif input_dep.type == "measurement":
-                inputs[NODE_TYPE_MEASUREMENT].append(input_dep.name)
+            node_type = DEPENDENCY_TYPE_TO_NODE_TYPE.get(input_dep.type)
+            if node_type is not None:
+                inputs[node_type].append(input_dep.name)
 
         # Process outputs
         for output_dep in module_data.outputs:
-            if output_dep.type == "image":
-                outputs[NODE_TYPE_IMAGE].append(output_dep.name)
-            elif output_dep.type == "object":
-                outputs[NODE_TYPE_OBJECT].append(output_dep.name)
-            elif output_dep.type == "measurement":
-                outputs[NODE_TYPE_MEASUREMENT].append(output_dep.name)
+            node_type = DEPENDENCY_TYPE_TO_NODE_TYPE.get(output_dep.type)
+            if node_type is not None:
+                outputs[node_type].append(output_dep.name)
 
         # Create ModuleInfo object
         module_info: ModuleInfo = {
@@ -440,9 +563,69 @@ def has_liveness_data(dependency_data: DependencyGraph) -> bool:
 
 
 # ----- GRAPH CONSTRUCTION FUNCTIONS -----
+class _GraphBuilder:
+    """
+    Lightweight insertion-ordered node/edge store used while building a graph.
+
+    Supports the subset of the nx.DiGraph construction API used by the graph
+    building helpers, and converts to a NetworkX DiGraph in one bulk load.
+    Node and edge order match what direct NetworkX construction would give.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.edges: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def add_node(self, node_id: str, **attr: Any) -> None:
+        """Add a node, updating attributes if it already exists."""
+        self.nodes.setdefault(node_id, {}).update(attr)
+
+    def add_nodes_from(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add (node_id, attrs) pairs, updating attributes of existing nodes."""
+        for node_id, attrs in nodes:
+            self.nodes.setdefault(node_id, {}).update(attrs)
+
+    def add_edges_from(self, edges: Iterable[Tuple[Any, ...]], **attr: Any) -> None:
+        """Add (src, dst) or (src, dst, attrs) edges, updating existing edges."""
+        for edge in edges:
+            edge_attrs = self.edges.setdefault((edge[0], edge[1]), {})
+            edge_attrs.update(attr)
+            if len(edge) == 3:
+                edge_attrs.update(edge[2])
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Bulk-load the collected nodes and edges into a NetworkX DiGraph."""
+        G = nx.DiGraph()
+        G.add_nodes_from(self.nodes.items())
+        G.add_edges_from((src, dst, attrs) for (src, dst), attrs in self.edges.items())
+        return G
+
+
+def _is_pipeline_json(data: Any) -> bool:
+    """
+    Check whether parsed JSON looks like a CellProfiler pipeline.
+
+    Pipeline modules carry an "attributes" dictionary; dependency graph
+    modules do not, and other JSON has no "modules" list at all.
+
+    Args:
+        data: The parsed JSON data
+
+    Returns:
+        True if the data has a "modules" list of pipeline modules
+    """
+    if not isinstance(data, dict):
+        return False
+    modules = data.get("modules")
+    return isinstance(modules, list) and all(
+        isinstance(module, dict) and "attributes" in module for module in modules
+    )
+
+
 def create_dependency_graph(
     pipeline_json: Dict[str, Any],
     include_disabled: bool = False,
+    stable_id_algo: str = STABLE_ID_ALGO_SHA256,
 ) -> GraphData:
     """
     Create a dependency graph showing data flow between modules.
@@ -450,43 +633,55 @@ def create_dependency_graph(
     Args:
         pipeline_json: The JSON representation of a CellProfiler pipeline
         include_disabled: Whether to include disabled modules
+        stable_id_algo: Hash algorithm used for stable module IDs
 
     Returns:
         A tuple of (graph, modules_info) where:
             - graph is a NetworkX DiGraph representing the pipeline
             - modules_info is a list of ModuleInfo dictionaries
     """
-    G = nx.DiGraph()
+    return create_dependency_graph_from_pipeline_modules(
+        pipeline_json.get("modules", []),
+        include_disabled=include_disabled,
+        stable_id_algo=stable_id_algo,
+    )
 
-    # Process each module to build the graph
-    modules_info: List[ModuleInfo] = []
 
-    for module in pipeline_json.get("modules", []):
-        # Extract module inputs and outputs
-        module_info = extract_module_io(module)
-        modules_info.append(module_info)
-
-        # Skip disabled modules if not explicitly included
-        if not module_info["enabled"] and not include_disabled:
-            continue
+def create_dependency_graph_from_pipeline_modules(
+    modules: Iterable[Dict[str, Any]],
+    include_disabled: bool = False,
+    stable_id_algo: str = STABLE_ID_ALGO_SHA256,
+) -> GraphData:
+    """
+    Create a dependency graph from an iterable of raw pipeline module dictionaries.
 
-        # Skip modules with no I/O data
-        if not _module_has_relevant_io(module_info):
-            continue
+    Modules are consumed one at a time, so a streaming parser can feed this
+    without the whole pipeline JSON being held in memory.
 
-        # Generate stable module ID and add module node
-        stable_id = _create_stable_module_id(module_info)
-        _add_module_node(G, module_info, stable_id)
+    Args:
+        modules: Iterable of CellProfiler module dictionaries from the pipeline JSON
+        include_disabled: Whether to include disabled modules
+        stable_id_algo: Hash algorithm used for stable module IDs
 
-        # Add data nodes and their connections to the module
-        _add_module_data_connections(G, module_info, stable_id)
+    Returns:
+        A tuple of (graph, modules_info)
+    """
+    # Extract every module's I/O in one comprehension; disabled modules keep
+    # their full I/O in modules_info even when left out of the graph
+    modules_info = [extract_module_io(module) for module in modules]
 
-    return G, modules_info
+    # Build the graph from the extracted module information
+    return create_dependency_graph_from_modules(
+        modules_info,
+        include_disabled=include_disabled,
+        stable_id_algo=stable_id_algo,
+    )
 
 
 def create_dependency_graph_from_modules(
     modules_info: List[ModuleInfo],
     include_disabled: bool = False,
+    stable_id_algo: str = STABLE_ID_ALGO_SHA256,
 ) -> GraphData:
     """
     Create a dependency graph from pre-extracted module information.
@@ -494,11 +689,13 @@ def create_dependency_graph_from_modules(
     Args:
         modules_info: List of ModuleInfo objects
         include_disabled: Whether to include disabled modules
+        stable_id_algo: Hash algorithm used for stable module IDs
 
     Returns:
         A tuple of (graph, modules_info)
     """
-    G = nx.DiGraph()
+    # Collect nodes and edges in plain dicts; convert to NetworkX once at the end
+    builder = _GraphBuilder()
 
     for module_info in modules_info:
         # Skip disabled modules if not explicitly included
@@ -509,19 +706,16 @@ def create_dependency_graph_from_modules(
         if not _module_has_relevant_io(module_info):
             continue
 
-        # Generate stable module ID and add module node
-        stable_id = _create_stable_module_id(module_info)
-        _add_module_node(G, module_info, stable_id)
+        # Add module node, data nodes and their connections in one pass
+        _add_module_to_graph(builder, module_info, stable_id_algo)
 
-        # Add data nodes and their connections to the module
-        _add_module_data_connections(G, module_info, stable_id)
-
-    return G, modules_info
+    return builder.to_networkx(), modules_info
 
 
 def adjust_load_data(
     modules_info: List[ModuleInfo],
     G: nx.DiGraph,
+    stable_id_algo: str = STABLE_ID_ALGO_SHA256,
 ) -> GraphData:
     """
     When LoadData is present and active in a pipeline, NamesAndTypes is disabled,
@@ -542,14 +736,20 @@ def adjust_load_data(
         return G, modules_info
 
     load_data_info = modules_info[i]
-    stable_id = _create_stable_module_id(load_data_info)
-
-    for node, attr in G.nodes(data=True):
-        if attr.get("type") == NODE_TYPE_IMAGE and G.in_degree(node) == 0:
-            load_data_info["outputs"][NODE_TYPE_IMAGE].append(attr["name"])
+    stable_id = _create_stable_module_id(load_data_info, stable_id_algo)
+
+    # Images with no producer are LoadData outputs
+    pred = G.pred
+    load_data_info["outputs"][NODE_TYPE_IMAGE].extend(
+        attr["name"]
+        for node, attr in G.nodes(data=True)
+        if attr.get("type") == NODE_TYPE_IMAGE and not pred[node]
+    )
 
-    _add_module_node(G, load_data_info, stable_id)
-    _add_module_data_connections(G, load_data_info, stable_id)
+    # As before, the stable ID above is computed without these inferred outputs
+    module_id = _add_module_node(G, load_data_info, stable_id)
+    _, _, pending_inputs, pending_outputs = _collect_module_io(load_data_info)
+    _add_module_connections(G, module_id, pending_inputs, pending_outputs)
 
     return G, modules_info
 
@@ -566,75 +766,107 @@ def _module_has_relevant_io(
     Returns:
         True if the module has any I/O, False otherwise
     """
-    # Check inputs - if any input type has values, return True
-    for _, inputs in module_info["inputs"].items():
-        if inputs:
-            return True
-
-    # Check outputs - if any output type has values, return True
-    for _, outputs in module_info["outputs"].items():
-        if outputs:
-            return True
-
-    # No I/O found
-    return False
+    # Every input/output type counts as relevant I/O, so no per-type filtering
+    # is needed; any() stops at the first non-empty list
+    return any(module_info["inputs"].values()) or any(module_info["outputs"].values())
 
 
 def _create_stable_module_id(
     module_info: ModuleInfo,
+    stable_id_algo: str = STABLE_ID_ALGO_SHA256,
 ) -> str:
     """
     Create a stable unique identifier for a module based on its I/O pattern.
 
     Args:
         module_info: Module information dictionary from extract_module_io
+        stable_id_algo: Hash algorithm, one of STABLE_ID_ALGOS. SHA-256 is the
+            default; BLAKE2b is cheaper but produces different IDs.
 
     Returns:
         A string identifier that is stable across runs and module reorderings
     """
-    module_type = module_info["module_name"]
+    # Collect all inputs/outputs for hash generation, encoded once up front
+    all_inputs, all_outputs, _, _ = _collect_module_io(module_info)
 
-    # Collect all inputs/outputs for hash generation
-    all_inputs: List[str] = []
-    all_outputs: List[str] = []
-
-    # Process inputs - normalize list types to regular types
-    for input_type, inputs in module_info["inputs"].items():
-        if not inputs or type(inputs) is not list:
-            continue
-
-        # Normalize list types to their regular counterparts for node IDs
-        normalized_type = input_type
-        if input_type == NODE_TYPE_IMAGE_LIST:
-            normalized_type = NODE_TYPE_IMAGE
-        elif input_type == NODE_TYPE_OBJECT_LIST:
-            normalized_type = NODE_TYPE_OBJECT
+    return _stable_id_from_io_ids(
+        module_info["module_name"], all_inputs, all_outputs, stable_id_algo
+    )
 
-        # Create normalized input identifiers
-        input_ids = [f"{normalized_type}__{inp}" for inp in inputs]
-        all_inputs.extend(input_ids)
 
-    # Process outputs
-    for output_type, outputs in module_info["outputs"].items():
-        if not outputs or type(outputs) is not list:
-            continue
+def _stable_id_from_io_ids(
+    module_type: str,
+    all_inputs: List[bytes],
+    all_outputs: List[bytes],
+    stable_id_algo: str = STABLE_ID_ALGO_SHA256,
+) -> str:
+    """
+    Hash a module's encoded input and output node IDs into its stable identifier.
 
-        # Create output identifiers (already normalized as there are no list outputs)
-        output_ids = [f"{output_type}__{out}" for out in outputs]
-        all_outputs.extend(output_ids)
+    Args:
+        module_type: The module name used as the ID prefix
+        all_inputs: UTF-8 encoded input node IDs (sorted in place)
+        all_outputs: UTF-8 encoded output node IDs (sorted in place)
+        stable_id_algo: Hash algorithm, one of STABLE_ID_ALGOS
 
-    # Sort for deterministic ordering (crucial for consistent hashing)
+    Returns:
+        A string identifier of the form ModuleType_hexhash
+    """
+    # Sort for deterministic ordering (crucial for consistent hashing);
+    # UTF-8 byte order matches the code point order of the original strings
     all_inputs.sort()
     all_outputs.sort()
 
-    # Create a stable unique identifier using a deterministic hash function
-    # Format is: inputs|outputs where both are comma-separated and sorted
-    io_pattern = ",".join(all_inputs) + "|" + ",".join(all_outputs)
+    return _hash_sorted_io_ids(
+        module_type, tuple(all_inputs), tuple(all_outputs), stable_id_algo
+    )
 
-    # Use SHA-256 hash which is deterministic across runs
-    hash_obj = hashlib.sha256(io_pattern.encode("utf-8"))
-    # Take exactly 8 hex characters as in the original
-    hash_val = int(hash_obj.hexdigest()[:8], 16)
+
+@functools.lru_cache(maxsize=4096)
+def _hash_sorted_io_ids(
+    module_type: str,
+    sorted_inputs: Tuple[bytes, ...],
+    sorted_outputs: Tuple[bytes, ...],
+    stable_id_algo: str,
+) -> str:
+    """
+    Hash sorted, encoded I/O node IDs into a stable module identifier.
+
+    Memoized so that modules with the same type and I/O pattern, e.g. when the
+    same pipeline is processed repeatedly in one session, are only hashed once.
+
+    Args:
+        module_type: The module name used as the ID prefix
+        sorted_inputs: Sorted UTF-8 encoded input node IDs
+        sorted_outputs: Sorted UTF-8 encoded output node IDs
+        stable_id_algo: Hash algorithm, one of STABLE_ID_ALGOS
+
+    Returns:
+        A string identifier of the form ModuleType_hexhash
+    """
+    if stable_id_algo == STABLE_ID_ALGO_SHA256:
+        # Use SHA-256 hash which is deterministic across runs
+        hash_obj = hashlib.sha256()
+    elif stable_id_algo == STABLE_ID_ALGO_BLAKE2B:
+        # 4-byte BLAKE2b digest gives the same 32-bit width directly
+        hash_obj = hashlib.blake2b(digest_size=4)
+    else:
+        raise ValueError(f"Unknown stable ID algorithm: {stable_id_algo}")
+
+    # Feed the hash piecewise rather than building the joined pattern string
+    # Format is: inputs|outputs where both are comma-separated and sorted
+    for i, input_id in enumerate(sorted_inputs):
+        if i:
+            hash_obj.update(b",")
+        hash_obj.update(input_id)
+    hash_obj.update(b"|")
+    for i, output_id in enumerate(sorted_outputs):
+        if i:
+            hash_obj.update(b",")
+        hash_obj.update(output_id)
+
+    # Take exactly 8 hex characters (4 bytes) as in the original
+    hash_val = int.from_bytes(hash_obj.digest()[:4], "big")
 
     # Format exactly as original: module_name_hash
     stable_id = f"{module_type}_{hash_val:x}"
@@ -659,14 +891,19 @@ def _ensure_valid_node_id(node_id: str) -> str:
     return node_id
 
 
-def _add_module_node(G: nx.DiGraph, module_info: ModuleInfo, stable_id: str) -> None:
+def _add_module_node(
+    G: nx.DiGraph | _GraphBuilder, module_info: ModuleInfo, stable_id: str
+) -> str:
     """
     Add a module node to the graph with all relevant attributes.
 
     Args:
-        G: The NetworkX graph to add the node to
+        G: The NetworkX graph (or graph builder) to add the node to
         module_info: Module information dictionary
         stable_id: The stable identifier for the module
+
+    Returns:
+        The module's node ID
     """
     # Keep the original module number in the label for reference
     original_num = module_info["module_num"]
@@ -694,106 +931,148 @@ def _add_module_node(G: nx.DiGraph, module_info: ModuleInfo, stable_id: str) ->
         enabled=module_info["enabled"],  # Enabled status
     )
 
+    return node_id
 
-def _add_module_data_connections(
-    G: nx.DiGraph,
+
+def _collect_module_io(
     module_info: ModuleInfo,
-    stable_id: str,
-) -> None:
+) -> Tuple[
+    List[bytes], List[bytes], List[_PendingConnection], List[_PendingConnection]
+]:
     """
-    Add all data nodes and their connections to a module in the graph.
+    Walk a module's inputs and outputs once, collecting everything derived from them.
+
+    This is the single place that turns module I/O into node IDs, so the stable
+    ID hash input and the graph's data nodes always agree.
 
     Args:
-        G: The NetworkX graph
         module_info: Module information dictionary
-        stable_id: The stable ID for the module
-    """
-    # Add input connections (data nodes → module)
-    _add_input_connections(G, module_info, stable_id)
 
-    # Add output connections (module → data nodes)
-    _add_output_connections(G, module_info, stable_id)
-
-
-def _add_input_connections(
-    G: nx.DiGraph,
-    module_info: ModuleInfo,
-    stable_id: str,
-) -> None:
+    Returns:
+        A tuple of (encoded input IDs, encoded output IDs, pending input
+        connections, pending output connections). Encoded IDs are the UTF-8
+        "type__name" strings hashed for the stable ID; pending connections hold
+        the (interned) node ID, node type, name and edge attributes. The edge
+        attributes dict is shared per type since graph insertion copies it
     """
-    Add all input data nodes and connections to the module in the graph.
+    all_inputs: List[bytes] = []
+    all_outputs: List[bytes] = []
+    pending_inputs: List[_PendingConnection] = []
+    pending_outputs: List[_PendingConnection] = []
 
-    Args:
-        G: The NetworkX graph
-        module_info: Module information dictionary
-        stable_id: The stable ID for the module
-    """
-    # Process each input type
     for input_type, inputs in module_info["inputs"].items():
         if not inputs or type(inputs) is not list:
             continue
 
-        # Ensure module_id is properly formatted
-        module_id = _ensure_valid_node_id(stable_id)
+        # Normalize node type for list inputs
+        normalized_type = LIST_TYPE_TO_BASE_TYPE.get(input_type, input_type)
 
-        # Process each input item
+        # Node ID prefix and edge type are constant per input type; the edge
+        # type preserves the original (list) type for connection semantics
+        prefix = normalized_type + "__"
+        edge_attrs = {"type": sys.intern(f"{input_type}_{EDGE_TYPE_INPUT}")}
         for input_item in inputs:
-            # Normalize node type for list inputs
-            normalized_type = input_type
-            if input_type == NODE_TYPE_IMAGE_LIST:
-                normalized_type = NODE_TYPE_IMAGE
-            elif input_type == NODE_TYPE_OBJECT_LIST:
-                normalized_type = NODE_TYPE_OBJECT
-
-            # Create normalized node ID and ensure it's properly formatted
-            raw_node_id = f"{normalized_type}__{input_item}"
-            node_id = _ensure_valid_node_id(raw_node_id)
-
-            # Add node if it doesn't exist
-            if not G.has_node(node_id):
-                G.add_node(
-                    node_id, type=normalized_type, name=input_item, label=input_item
+            raw_node_id = prefix + input_item
+            all_inputs.append(raw_node_id.encode("utf-8"))
+            pending_inputs.append(
+                (
+                    sys.intern(_ensure_valid_node_id(raw_node_id)),
+                    normalized_type,
+                    input_item,
+                    edge_attrs,
+                )
+            )
+
+    # Outputs are already normalized as there are no list outputs
+    for output_type, outputs in module_info["outputs"].items():
+        if not outputs or type(outputs) is not list:
+            continue
+
+        prefix = output_type + "__"
+        edge_attrs = {"type": sys.intern(f"{output_type}_{EDGE_TYPE_OUTPUT}")}
+        for output_item in outputs:
+            raw_node_id = prefix + output_item
+            all_outputs.append(raw_node_id.encode("utf-8"))
+            pending_outputs.append(
+                (
+                    sys.intern(_ensure_valid_node_id(raw_node_id)),
+                    output_type,
+                    output_item,
+                    edge_attrs,
                 )
+            )
 
-            # Add edge from input to module - preserve original edge type for connection semantics
-            G.add_edge(node_id, module_id, type=f"{input_type}_{EDGE_TYPE_INPUT}")
+    return all_inputs, all_outputs, pending_inputs, pending_outputs
 
 
-def _add_output_connections(
-    G: nx.DiGraph,
-    module_info: ModuleInfo,
-    stable_id: str,
+def _add_module_connections(
+    G: nx.DiGraph | _GraphBuilder,
+    module_id: str,
+    pending_inputs: List[_PendingConnection],
+    pending_outputs: List[_PendingConnection],
 ) -> None:
     """
-    Add all output data nodes and connections from the module in the graph.
+    Add a module's data nodes and connections to the graph in batches.
+
+    Data nodes shared with earlier modules already carry the same
+    type/name/label and are not added again.
 
     Args:
-        G: The NetworkX graph
-        module_info: Module information dictionary
-        stable_id: The stable ID for the module
+        G: The NetworkX graph (or graph builder)
+        module_id: The module's node ID, as returned by _add_module_node
+        pending_inputs: Input connections from _collect_module_io
+        pending_outputs: Output connections from _collect_module_io
     """
-    # Process each output type
-    for output_type, outputs in module_info["outputs"].items():
-        if not outputs or type(outputs) is not list:
-            continue
+    known_nodes = G.nodes
 
-        # Ensure module_id is properly formatted
-        module_id = _ensure_valid_node_id(stable_id)
+    # Add input connections (data nodes → module)
+    G.add_nodes_from(
+        (node_id, {"type": node_type, "name": name, "label": name})
+        for node_id, node_type, name, _ in pending_inputs
+        if node_id not in known_nodes
+    )
+    G.add_edges_from(
+        (node_id, module_id, edge_attrs) for node_id, _, _, edge_attrs in pending_inputs
+    )
 
-        # Process each output item
-        for output_item in outputs:
-            # Create node ID with type prefix and ensure it's properly formatted
-            raw_node_id = f"{output_type}__{output_item}"
-            node_id = _ensure_valid_node_id(raw_node_id)
-
-            # Add node if it doesn't exist
-            if not G.has_node(node_id):
-                G.add_node(
-                    node_id, type=output_type, name=output_item, label=output_item
-                )
+    # Add output connections (module → data nodes)
+    G.add_nodes_from(
+        (node_id, {"type": node_type, "name": name, "label": name})
+        for node_id, node_type, name, _ in pending_outputs
+        if node_id not in known_nodes
+    )
+    G.add_edges_from(
+        (module_id, node_id, edge_attrs)
+        for node_id, _, _, edge_attrs in pending_outputs
+    )
+
+
+def _add_module_to_graph(
+    G: nx.DiGraph | _GraphBuilder,
+    module_info: ModuleInfo,
+    stable_id_algo: str = STABLE_ID_ALGO_SHA256,
+) -> None:
+    """
+    Add a module node with all of its data nodes and connections to the graph.
+
+    The module's I/O is walked once for both the stable ID hash input and the
+    connections.
+
+    Args:
+        G: The NetworkX graph (or graph builder)
+        module_info: Module information dictionary
+        stable_id_algo: Hash algorithm used for the stable module ID
+    """
+    all_inputs, all_outputs, pending_inputs, pending_outputs = _collect_module_io(
+        module_info
+    )
 
-            # Add edge from module to output
-            G.add_edge(module_id, node_id, type=f"{output_type}_{EDGE_TYPE_OUTPUT}")
+    # Finalize the stable ID and add the module node before its connections
+    stable_id = _stable_id_from_io_ids(
+        module_info["module_name"], all_inputs, all_outputs, stable_id_algo
+    )
+    module_id = _add_module_node(G, module_info, stable_id)
+    _add_module_connections(G, module_id, pending_inputs, pending_outputs)
 
 
 # ----- GRAPH FORMATTING AND OUTPUT -----
@@ -817,32 +1096,34 @@ def apply_liveness_styling(G: nx.DiGraph, dependency_data: DependencyGraph) -> N
             "disposed": disposed,
         }
 
-    # Apply styling to edges
-    for edge in G.edges(data=True):
-        src, dst, _ = edge
-        src_type = G.nodes[src].get("type")
-        dst_type = G.nodes[dst].get("type")
+    # Apply styling to edges, binding each node's and edge's attribute dict once
+    node_data = G.nodes
+    for src, dst, edge_attrs in G.edges(data=True):
+        src_attrs = node_data[src]
+        dst_attrs = node_data[dst]
+        src_type = src_attrs.get("type")
+        dst_type = dst_attrs.get("type")
 
         if src_type == NODE_TYPE_MODULE and dst_type in (
             NODE_TYPE_IMAGE,
             NODE_TYPE_OBJECT,
         ):
-            module_node = src
-            data_node = dst
+            module_attrs = src_attrs
+            data_attrs = dst_attrs
         elif (
             src_type in (NODE_TYPE_IMAGE, NODE_TYPE_OBJECT)
             and dst_type == NODE_TYPE_MODULE
         ):
-            module_node = dst
-            data_node = src
+            module_attrs = dst_attrs
+            data_attrs = src_attrs
         else:
             continue
 
-        data_name = G.nodes[data_node].get("name")
+        data_name = data_attrs.get("name")
         if not data_name:
             continue
 
-        module_num = G.nodes[module_node].get("module_num")
+        module_num = module_attrs.get("module_num")
 
         if not module_num or module_num not in module_liveness:
             continue
@@ -852,12 +1133,12 @@ def apply_liveness_styling(G: nx.DiGraph, dependency_data: DependencyGraph) -> N
         # Apply styling based on liveness
         if data_name in liveness_data["disposed"]:
             # Red for disposed
-            G.edges[src, dst]["color"] = "red"
-            G.edges[src, dst]["penwidth"] = "2"
+            edge_attrs["color"] = "red"
+            edge_attrs["penwidth"] = "2"
         elif data_name in liveness_data["live"]:
             # Green for live
-            G.edges[src, dst]["color"] = "green"
-            G.edges[src, dst]["penwidth"] = "2"
+            edge_attrs["color"] = "green"
+            edge_attrs["penwidth"] = "2"
 
 
 def apply_node_styling(G: nx.DiGraph, no_formatting: bool = False) -> None:
@@ -872,71 +1153,82 @@ def apply_node_styling(G: nx.DiGraph, no_formatting: bool = False) -> None:
     if no_formatting:
         return
 
+    # Local aliases for the lookup tables used on every node
+    shapes = STYLE_SHAPES
+    stylers = NODE_STYLERS
+
     # Process each node in the graph
-    for node, attrs in G.nodes(data=True):
+    for _, attrs in G.nodes(data=True):
         node_type = attrs.get("type")
 
         # Apply basic styling common to all node types
-        if node_type in STYLE_SHAPES:
-            G.nodes[node]["shape"] = STYLE_SHAPES[node_type]
+        # (attrs is the node's live attribute dict, so it is updated directly)
+        if node_type in shapes:
+            attrs["shape"] = shapes[node_type]
 
         # Apply type-specific styling
-        if node_type == NODE_TYPE_MODULE:
-            # Module node styling
-            _apply_module_node_styling(G, node, attrs)
-        elif node_type in (NODE_TYPE_IMAGE, NODE_TYPE_OBJECT, NODE_TYPE_MEASUREMENT):
-            # Data nodes (image, object, measurement) styling
-            _apply_data_node_styling(G, node, node_type)
+        styler = stylers.get(node_type)
+        if styler is not None:
+            styler(attrs, node_type)
 
 
-def _apply_module_node_styling(G: nx.DiGraph, node: str, attrs: Dict[str, Any]) -> None:
+def _apply_module_node_styling(attrs: Dict[str, Any], node_type: str) -> None:
     """
     Apply styling specific to module nodes.
 
     Args:
-        G: The NetworkX graph
-        node: The node identifier
-        attrs: Node attributes
+        attrs: Node attribute dictionary to update
+        node_type: The type of the node (always NODE_TYPE_MODULE)
     """
     # Base style for all module nodes
-    G.nodes[node]["style"] = "filled"
-    G.nodes[node]["fontname"] = "Helvetica-Bold"
+    attrs["style"] = "filled"
+    attrs["fontname"] = "Helvetica-Bold"
+
+    colors = STYLE_COLORS[node_type]
 
     # Check if node is filtered
     if attrs.get("filtered", False):
-        G.nodes[node]["fillcolor"] = STYLE_COLORS[NODE_TYPE_MODULE]["filtered"]
-        G.nodes[node]["style"] = "filled,dashed"  # Add dashed border
+        attrs["fillcolor"] = colors["filtered"]
+        attrs["style"] = "filled,dashed"  # Add dashed border
     # Style enabled/disabled modules differently
     elif not attrs.get("enabled", True):
         # Disabled module
-        G.nodes[node]["fillcolor"] = STYLE_COLORS[NODE_TYPE_MODULE]["disabled"]
-        G.nodes[node]["style"] = "filled,dashed"  # Add dashed border
+        attrs["fillcolor"] = colors["disabled"]
+        attrs["style"] = "filled,dashed"  # Add dashed border
     else:
         # Enabled module
-        G.nodes[node]["fillcolor"] = STYLE_COLORS[NODE_TYPE_MODULE]["enabled"]
+        attrs["fillcolor"] = colors["enabled"]
 
 
-def _apply_data_node_styling(G: nx.DiGraph, node: str, node_type: str) -> None:
+def _apply_data_node_styling(attrs: Dict[str, Any], node_type: str) -> None:
     """
     Apply styling specific to data nodes (images, objects).
 
     Args:
-        G: The NetworkX graph
-        node: The node identifier
+        attrs: Node attribute dictionary to update
         node_type: The type of the node
     """
     # Apply common styling for data nodes
-    G.nodes[node]["style"] = "filled"
+    attrs["style"] = "filled"
 
     # Apply type-specific color
     if node_type in STYLE_COLORS:
         # Check if the node is filtered
-        is_filtered = G.nodes[node].get("filtered", False)
+        is_filtered = attrs.get("filtered", False)
         if is_filtered:
-            G.nodes[node]["fillcolor"] = STYLE_COLORS[node_type]["filtered"]
-            G.nodes[node]["style"] = "filled,dashed"
+            attrs["fillcolor"] = STYLE_COLORS[node_type]["filtered"]
+            attrs["style"] = "filled,dashed"
         else:
-            G.nodes[node]["fillcolor"] = STYLE_COLORS[node_type]["normal"]
+            attrs["fillcolor"] = STYLE_COLORS[node_type]["normal"]
+
+
+# Type-specific node stylers used by apply_node_styling
+NODE_STYLERS = {
+    NODE_TYPE_MODULE: _apply_module_node_styling,
+    NODE_TYPE_IMAGE: _apply_data_node_styling,
+    NODE_TYPE_OBJECT: _apply_data_node_styling,
+    NODE_TYPE_MEASUREMENT: _apply_data_node_styling,
+}
 
 
 def _identify_source_nodes(G: nx.DiGraph, ignore_filtered: bool = False) -> List[str]:
@@ -987,8 +1279,6 @@ def _identify_sink_nodes(G: nx.DiGraph, ignore_filtered: bool = False) -> List[s
     Returns:
         List of node IDs to rank at the bottom
     """
-    import fnmatch
-
     sink_nodes = []
 
     # Find module nodes that match sink criteria:
@@ -1005,11 +1295,9 @@ def _identify_sink_nodes(G: nx.DiGraph, ignore_filtered: bool = False) -> List[s
             module_name = attrs.get("module_name", "")
 
             # Check if module name matches any of the sink module patterns
-            for pattern in SINK_MODULE_PATTERNS:
-                if fnmatch.fnmatch(module_name, pattern):
-                    # Node IDs are already properly formatted in the graph
-                    sink_nodes.append(node)
-                    break
+            if SINK_MODULE_REGEX.match(module_name):
+                # Node IDs are already properly formatted in the graph
+                sink_nodes.append(node)
 
     return sink_nodes
 
@@ -1034,50 +1322,46 @@ def prepare_for_dot_output(
         rank_ignore_filtered: If True, ignore filtered nodes when calculating rank positions
 
     Returns:
-        A new NetworkX DiGraph prepared for DOT output
+        A new NetworkX DiGraph prepared for DOT output. Rank information is stored
+        on this new graph; G itself only has its display labels set.
     """
-    G_ordered = nx.DiGraph()
-
     # If ultra_minimal is enabled, create a stripped-down version with only essential structure
     if ultra_minimal:
-        # Process nodes - keep only the type attribute
-        for node in sorted(G.nodes()):
-            node_type = G.nodes[node].get("type", "unknown")
-            # Add only the type attribute, nothing else (node IDs already properly formatted)
-            G_ordered.add_node(node, type=node_type)
-
-        # Process edges - keep no attributes
-        edge_list = sorted(G.edges(data=True), key=lambda x: (x[0], x[1]))
-        for src, dst, _ in edge_list:
-            G_ordered.add_edge(src, dst)
+        G_ordered = nx.DiGraph()
+
+        # Process nodes - keep only the type attribute, nothing else (node IDs
+        # already properly formatted), added in one bulk call
+        G_ordered.add_nodes_from(
+            (node, {"type": attrs.get("type", "unknown")})
+            for node, attrs in sorted(G.nodes(data=True))
+        )
+
+        # Process edges - keep no attributes; (src, dst) pairs are unique, so
+        # plain tuple ordering sorts them without a per-edge key function
+        G_ordered.add_edges_from(sorted(G.edges()))
     else:
         # Set proper display labels for all nodes
         for node, attrs in G.nodes(data=True):
-            node_type = attrs.get("type")
-
-            if node_type == NODE_TYPE_MODULE:
+            if attrs.get("type") == NODE_TYPE_MODULE:
                 # Use the provided label for modules
-                G.nodes[node]["label"] = attrs.get("label")
+                attrs["label"] = attrs.get("label")
             else:
-                # For data nodes, use just the name without the type prefix
-                name = attrs.get(
-                    "name", node.split("__", 1)[1] if "__" in node else node
-                )
-                # Fix for pydot: ensure we don't have duplicate "name" attributes
-                if "name" in G.nodes[node] and "name" != "label":
-                    del G.nodes[node]["name"]
-                G.nodes[node]["label"] = name
-
-        # Add nodes in sorted order by name for consistent output
-        for node in sorted(G.nodes()):
-            G_ordered.add_node(node, **G.nodes[node])
-
-        # Add edges in sorted order
-        edge_list = sorted(G.edges(data=True), key=lambda x: (x[0], x[1]))
-        for src, dst, attrs in edge_list:
-            G_ordered.add_edge(src, dst, **attrs)
-
-        # Add rank information for DOT output if requested
+                # For data nodes, use just the name without the type prefix.
+                # Popping "name" also fixes pydot: it must not be written twice
+                name = attrs.pop("name", None)
+                if name is None:
+                    name = node.split("__", 1)[1] if "__" in node else node
+                attrs["label"] = name
+
+        # Add nodes and edges in sorted order for consistent output, in bulk;
+        # node IDs and (source, target) pairs are unique, so plain tuple
+        # ordering never compares the attribute dicts
+        G_ordered = nx.DiGraph()
+        G_ordered.add_nodes_from(sorted(G.nodes(data=True)))
+        G_ordered.add_edges_from(sorted(G.edges(data=True)))
+
+        # Add rank information for DOT output if requested; identified on G so
+        # rank statements keep the pipeline's module order
         if rank_nodes:
             # Identify source nodes (to be positioned at the top)
             source_nodes = _identify_source_nodes(G, rank_ignore_filtered)
@@ -1092,55 +1376,183 @@ def prepare_for_dot_output(
     return G_ordered
 
 
-def _add_rank_statements(dot_file_path: str, G: nx.DiGraph) -> None:
+def _add_rank_statements(dot_content: str, G: nx.DiGraph) -> str:
     """
-    Add rank statements to a DOT file to position nodes at top or bottom.
+    Add rank statements to DOT text to position nodes at top or bottom.
 
     Args:
-        dot_file_path: Path to the DOT file to modify
+        dot_content: DOT text produced for the graph
         G: The NetworkX graph with rank information
+
+    Returns:
+        The DOT text with rank statements inserted before the closing brace,
+        or unchanged if there is no rank information or no closing brace
+    """
+    rank_statements = []
+
+    # Add rank=min for source nodes (positioned at top)
+    if G.graph.get("dot_rank_min"):
+        min_nodes = "; ".join(G.graph["dot_rank_min"])
+        rank_statements.append(f"  {{rank = {RANK_MIN}; {min_nodes};}}")
+
+    # Add rank=max for sink nodes (positioned at bottom)
+    if G.graph.get("dot_rank_max"):
+        max_nodes = "; ".join(G.graph["dot_rank_max"])
+        rank_statements.append(f"  {{rank = {RANK_MAX}; {max_nodes};}}")
+
+    # Find the position just before the closing brace
+    closing_pos = dot_content.rfind("}")
+    if not rank_statements or closing_pos == -1:
+        return dot_content
+
+    # Insert rank statements before the closing brace
+    return (
+        dot_content[:closing_pos]
+        + "\n"
+        + "\n".join(rank_statements)
+        + "\n"
+        + dot_content[closing_pos:]
+    )
+
+
+def _is_plain_dot_id(value: str) -> bool:
     """
-    # Check if rank information is available
-    if not ("dot_rank_min" in G.graph or "dot_rank_max" in G.graph):
-        return
+    Check whether a string can appear unquoted as a DOT identifier.
 
-    try:
-        # Read the existing DOT file
-        with open(dot_file_path, "r") as f:
-            dot_content = f.read()
-
-        # Find the position just before the closing brace
-        closing_pos = dot_content.rfind("}")
-        if closing_pos == -1:
-            return  # Cannot find closing brace, abort
-
-        rank_statements = []
-
-        # Add rank=min for source nodes (positioned at top)
-        if "dot_rank_min" in G.graph and G.graph["dot_rank_min"]:
-            min_nodes = "; ".join(G.graph["dot_rank_min"])
-            rank_statements.append(f"  {{rank = {RANK_MIN}; {min_nodes};}}")
-
-        # Add rank=max for sink nodes (positioned at bottom)
-        if "dot_rank_max" in G.graph and G.graph["dot_rank_max"]:
-            max_nodes = "; ".join(G.graph["dot_rank_max"])
-            rank_statements.append(f"  {{rank = {RANK_MAX}; {max_nodes};}}")
-
-        # Insert rank statements before the closing brace
-        if rank_statements:
-            new_content = (
-                dot_content[:closing_pos]
-                + "\n"
-                + "\n".join(rank_statements)
-                + "\n"
-                + dot_content[closing_pos:]
-            )
+    Args:
+        value: Node ID or attribute value
 
-            # Write the updated content back to the file
-            with open(dot_file_path, "w") as f:
-                f.write(new_content)
-    except Exception as e:
-        print(f"Warning: Failed to add rank statements to DOT file: {e}")
+    Returns:
+        True if the value needs no quoting in DOT output
+    """
+    return DOT_PLAIN_ID.fullmatch(value) is not None and (
+        value.lower() not in DOT_KEYWORDS
+    )
+
+
+def _format_ultra_minimal_dot(G: nx.DiGraph) -> Optional[str]:
+    """
+    Format a graph as ultra-minimal DOT text directly, without going through pydot.
+
+    Produces the same text as writing the graph from prepare_for_dot_output in
+    ultra-minimal mode with pydot (sorted nodes with only their type, sorted
+    edges without attributes), without building the intermediate graph.
+
+    Args:
+        G: The NetworkX graph
+
+    Returns:
+        The DOT text, or None if a node ID or type needs quoting and the pydot
+        writer should be used instead
+    """
+    lines = ["strict digraph {"]
+    node_data = G.nodes
+    sorted_nodes = sorted(node_data)
+    for node in sorted_nodes:
+        node_type = node_data[node].get("type", "unknown")
+        if not (_is_plain_dot_id(node) and _is_plain_dot_id(node_type)):
+            return None
+        lines.append(f"{node} [type={node_type}];")
+
+    # Edges in (source, target) order: walk sources in sorted order and sort
+    # only each source's targets instead of sorting all edge tuples together
+    succ = G.succ
+    lines.extend(
+        f"{src} -> {dst};" for src in sorted_nodes for dst in sorted(succ[src])
+    )
+    lines.append("}\n")
+    return "\n".join(lines)
+
+
+@functools.cache
+def _load_dot_writer():
+    """
+    Import pydot once and return the NetworkX DOT writer.
+
+    Returns:
+        The nx_pydot write_dot function
+
+    Raises:
+        ImportError: If pydot is not available
+    """
+    import pydot  # noqa: F401
+
+    return nx.drawing.nx_pydot.write_dot
+
+
+def _without_edge_attributes(G: nx.DiGraph, keys: Tuple[str, ...]) -> nx.DiGraph:
+    """
+    Create a copy of a graph for output with the given edge attributes left out.
+
+    The original graph keeps its edge attributes. Node attribute dicts are
+    shallow-copied so output preparation cannot modify the original either.
+
+    Args:
+        G: The NetworkX graph
+        keys: Edge attribute names to leave out
+
+    Returns:
+        A new graph with the same nodes and edges but without those edge attributes
+    """
+    G_out = nx.DiGraph()
+    G_out.graph.update(G.graph)
+    G_out.add_nodes_from(G.nodes(data=True))
+    G_out.add_edges_from(
+        (src, dst, {k: v for k, v in attrs.items() if k not in keys})
+        for src, dst, attrs in G.edges(data=True)
+    )
+    return G_out
+
+
+@functools.cache
+def _load_ijson():
+    """
+    Import ijson on first use; it is only needed for --stream.
+
+    Returns:
+        The ijson module
+
+    Raises:
+        ImportError: If ijson is not available
+    """
+    import ijson
+
+    return ijson
+
+
+def _stream_pipeline_modules(f: Any, pipeline_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream pipeline modules from an open JSON file with ijson.
+
+    Modules are checked as they arrive, the same way _is_pipeline_json checks
+    a loaded file. If no module arrives, the file is scanned once more for a
+    top-level "modules" array, so an empty pipeline is still accepted.
+
+    Args:
+        f: The pipeline JSON file, opened in binary mode
+        pipeline_path: Path to the pipeline file, for error messages
+
+    Yields:
+        Raw CellProfiler module dictionaries
+
+    Raises:
+        click.ClickException: If the file is not a CellProfiler pipeline
+    """
+    ijson = _load_ijson()
+    found_module = False
+    for module in ijson.items(f, "modules.item"):
+        if not (isinstance(module, dict) and "attributes" in module):
+            raise _not_pipeline_error(pipeline_path)
+        found_module = True
+        yield module
+
+    if not found_module:
+        f.seek(0)
+        if not any(
+            prefix == "modules" and event == "start_array"
+            for prefix, event, _ in ijson.parse(f)
+        ):
+            raise _not_pipeline_error(pipeline_path)
 
 
 def write_graph_to_file(
@@ -1150,6 +1562,7 @@ def write_graph_to_file(
     rank_nodes: bool = False,
     rank_ignore_filtered: bool = False,
     quiet = False,
+    drop_edge_keys: Tuple[str, ...] = (),
 ) -> None:
     """
     Write the graph to the specified output file in the appropriate format.
@@ -1160,34 +1573,54 @@ def write_graph_to_file(
         ultra_minimal: If True, create a stripped-down version for exact diff comparison
         rank_nodes: If True, add rank statements to position source and sink nodes
         rank_ignore_filtered: If True, ignore filtered nodes when calculating rank positions
+        drop_edge_keys: Edge attributes to leave out of the output (G is not modified)
     """
-    ext = Path(output_path).suffix.lower()
+    path = Path(output_path)
+    ext = path.suffix.lower()
+
+    # Drop requested edge attributes, unless the output omits edge attributes anyway
+    if drop_edge_keys and not (ext == ".dot" and ultra_minimal):
+        G = _without_edge_attributes(G, drop_edge_keys)
 
-    if ext == ".graphml":
-        nx.write_graphml(G, output_path)
-    elif ext == ".gexf":
-        nx.write_gexf(G, output_path)
-    elif ext == ".dot":
+    if ext == ".dot":
         try:
-            # For DOT format, prepare the graph with consistent ordering
-            G_ordered = prepare_for_dot_output(
-                G,
-                ultra_minimal=ultra_minimal,
-                rank_nodes=rank_nodes,
-                rank_ignore_filtered=rank_ignore_filtered,
-            )
-            nx.drawing.nx_pydot.write_dot(G_ordered, output_path)
+            # Ultra-minimal graphs are usually simple enough to format straight
+            # from G, without pydot or an intermediate ordered graph
+            dot_text = _format_ultra_minimal_dot(G) if ultra_minimal else None
+            if dot_text is None:
+                # Load pydot before prepare_for_dot_output sets labels on G
+                write_dot = _load_dot_writer()
+
+                # For DOT format, prepare the graph with consistent ordering
+                G_ordered = prepare_for_dot_output(
+                    G,
+                    ultra_minimal=ultra_minimal,
+                    rank_nodes=rank_nodes,
+                    rank_ignore_filtered=rank_ignore_filtered,
+                )
+                buffer = io.StringIO()
+                write_dot(G_ordered, buffer)
+                dot_text = buffer.getvalue()
 
-            # Add rank statements to DOT file if requested and not in ultra-minimal mode
-            if rank_nodes and not ultra_minimal:
-                _add_rank_statements(output_path, G_ordered)
+                # Add rank statements if requested and not in ultra-minimal mode,
+                # so the file is written exactly once
+                if rank_nodes and not ultra_minimal:
+                    dot_text = _add_rank_statements(dot_text, G_ordered)
+
+            with open(output_path, "w") as f:
+                f.write(dot_text)
 
         except ImportError:
             print("Warning: pydot not available. Saving as GraphML instead.")
-            nx.write_graphml(G, output_path.replace(ext, ".graphml"))
+            with open(
+                path.with_suffix(".graphml"), "wb", buffering=OUTPUT_BUFFER_SIZE
+            ) as f:
+                nx.write_graphml(G, f)
     else:
-        # Default to GraphML
-        nx.write_graphml(G, output_path)
+        # GraphML or GEXF by extension, defaulting to GraphML
+        writer = GRAPH_WRITERS.get(ext, nx.write_graphml)
+        with open(output_path, "wb", buffering=OUTPUT_BUFFER_SIZE) as f:
+            writer(G, f)
 
     if not quiet:
         print(f"Graph saved to: {output_path}")
@@ -1204,26 +1637,22 @@ def print_pipeline_summary(G: nx.DiGraph, pipeline_path: str) -> None:
     # Print pipeline summary
     print(f"Pipeline: {pipeline_path}")
 
-    # Count different node types
-    node_counts = {}
+    # Count node types and disabled modules in a single pass
+    node_counts: Counter[Optional[str]] = Counter()
+    disabled_modules = 0
     for _, attr in G.nodes(data=True):
         node_type = attr.get("type")
-        if node_type not in node_counts:
-            node_counts[node_type] = 0
         node_counts[node_type] += 1
-
-    module_nodes = [
-        n for n, attr in G.nodes(data=True) if attr.get("type") == NODE_TYPE_MODULE
-    ]
-    enabled_modules = [n for n in module_nodes if G.nodes[n].get("enabled", True)]
-    disabled_modules = [n for n in module_nodes if not G.nodes[n].get("enabled", True)]
+        if node_type == NODE_TYPE_MODULE and not attr.get("enabled", True):
+            disabled_modules += 1
+    enabled_modules = node_counts[NODE_TYPE_MODULE] - disabled_modules
 
     # Print node type counts
     print("Graph contains:")
     for node_type, count in sorted(node_counts.items()):
         if node_type == NODE_TYPE_MODULE:
             print(
-                f"  {count} modules ({len(enabled_modules)} enabled, {len(disabled_modules)} disabled)"
+                f"  {count} modules ({enabled_modules} enabled, {disabled_modules} disabled)"
             )
         else:
             print(f"  {count} {node_type} nodes")
@@ -1237,46 +1666,61 @@ def print_connections(G: nx.DiGraph) -> None:
     Args:
         G: The NetworkX graph
     """
-    print("\nConnections:")
-    for edge in G.edges(data=True):
-        src, dst, _ = edge
-        src_type = G.nodes[src].get("type") or ""
-        dst_type = G.nodes[dst].get("type") or ""
+    # Collect output lines and write them once, instead of one print per edge
+    lines = ["\nConnections:"]
+    # Format each module's "[name #num (disabled)]" display once, rather than
+    # re-reading its attributes for every incident edge
+    node_data = G.nodes
+    module_labels = {
+        node: f"[{attrs.get('module_name')} #{attrs.get('module_num')}"
+        f"{'' if attrs.get('enabled', True) else ' (disabled)'}]"
+        for node, attrs in node_data(data=True)
+        if attrs.get("type") == NODE_TYPE_MODULE
+    }
 
+    # Likewise format each data node's "name (type)" display once: the actual
+    # name without the type prefix, and a readable type
+    data_labels = {
+        node: f"{_data_node_name(node, attrs)} "
+        f"({(attrs.get('type') or '').replace('_list', ' list').replace('_', ' ')})"
+        for node, attrs in node_data(data=True)
+        if node not in module_labels
+    }
+
+    for src, dst in G.edges():
         # Only show module connections
-        if dst_type == NODE_TYPE_MODULE:
+        dst_label = module_labels.get(dst)
+        if dst_label is not None:
             # Input connection
-            module_name = G.nodes[dst].get("module_name")
-            module_num = G.nodes[dst].get("module_num")
-            module_enabled = G.nodes[dst].get("enabled", True)
-            status = " (disabled)" if not module_enabled else ""
-
-            # Extract the actual name without the type prefix
-            src_name = G.nodes[src].get(
-                "name", src.split("__", 1)[1] if "__" in src else src
-            )
-            src_disp_type = src_type.replace("_list", " list").replace("_", " ")
-
-            print(
-                f"  {src_name} ({src_disp_type}) → [{module_name} #{module_num}{status}]"
-            )
+            lines.append(f"  {data_labels[src]} → {dst_label}")
+            continue
 
-        elif src_type == NODE_TYPE_MODULE:
+        src_label = module_labels.get(src)
+        if src_label is not None:
             # Output connection
-            module_name = G.nodes[src].get("module_name")
-            module_num = G.nodes[src].get("module_num")
-            module_enabled = G.nodes[src].get("enabled", True)
-            status = " (disabled)" if not module_enabled else ""
-
-            # Extract the actual name without the type prefix
-            dst_name = G.nodes[dst].get(
-                "name", dst.split("__", 1)[1] if "__" in dst else dst
-            )
-            dst_disp_type = dst_type.replace("_list", " list").replace("_", " ")
+            lines.append(f"  {src_label} → {data_labels[dst]}")
 
-            print(
-                f"  [{module_name} #{module_num}{status}] → {dst_name} ({dst_disp_type})"
-            )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _data_node_name(node_id: str, attrs: Dict[str, Any]) -> str:
+    """
+    Get a data node's display name.
+
+    Construction always stores the name, so the type prefix is only stripped
+    from the node ID as a fallback.
+
+    Args:
+        node_id: The data node ID (type__name)
+        attrs: The node's attribute dictionary
+
+    Returns:
+        The data item name without the type prefix
+    """
+    name = attrs.get("name")
+    if name is None:
+        name = node_id.split("__", 1)[1] if "__" in node_id else node_id
+    return name
 
 
 def print_stable_id_mapping(G: nx.DiGraph) -> None:
@@ -1286,7 +1730,7 @@ def print_stable_id_mapping(G: nx.DiGraph) -> None:
     Args:
         G: The NetworkX graph
     """
-    print("\nStable module ID mapping:")
+    lines = ["\nStable module ID mapping:"]
     module_nodes = [
         n for n, attr in G.nodes(data=True) if attr.get("type") == NODE_TYPE_MODULE
     ]
@@ -1295,11 +1739,37 @@ def print_stable_id_mapping(G: nx.DiGraph) -> None:
         orig_num = attrs.get("original_num", "?")
         module_name = attrs.get("module_name", "Unknown")
         enabled = "" if attrs.get("enabled", True) else " (disabled)"
-        print(f"  {node} → {module_name} #{orig_num}{enabled}")
+        lines.append(f"  {node} → {module_name} #{orig_num}{enabled}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _remove_nodes(G: nx.DiGraph, nodes: List[str], inplace: bool) -> nx.DiGraph:
+    """
+    Remove nodes from a graph, either in place or by copying only the kept part.
+
+    Copying the kept subgraph is a single pass, instead of copying the whole
+    graph and then tearing down the removed nodes.
+
+    Args:
+        G: The NetworkX graph
+        nodes: Node IDs to remove
+        inplace: If True, remove the nodes from G itself
+
+    Returns:
+        The graph without the given nodes
+    """
+    if inplace:
+        G.remove_nodes_from(nodes)
+        return G
+    removed = set(nodes)
+    return G.subgraph([node for node in G if node not in removed]).copy()
 
 
 def filter_keep_reachable_from_roots(
-    G: nx.DiGraph, root_node_names: List[str], highlight_filtered: bool = False
+    G: nx.DiGraph,
+    root_node_names: List[str],
+    highlight_filtered: bool = False,
+    inplace: bool = False,
 ) -> Tuple[nx.DiGraph, int]:
     """
     Filter graph to only keep nodes reachable from specified root nodes.
@@ -1308,13 +1778,11 @@ def filter_keep_reachable_from_roots(
         G: The original NetworkX graph
         root_node_names: List of root node names to include (without type prefixes)
         highlight_filtered: If True, mark filtered nodes instead of removing them
+        inplace: If True, modify G itself instead of a copy
 
     Returns:
         A tuple of (filtered graph, number of nodes affected)
     """
-    # Create a copy of the graph to modify
-    filtered_graph = G.copy()
-
     # Find all root image nodes (nodes with a source module as parent)
     all_root_nodes = [
         node
@@ -1328,56 +1796,63 @@ def filter_keep_reachable_from_roots(
 
     # If no root nodes specified, return the original graph
     if not root_node_names:
-        return filtered_graph, 0
+        return (G if inplace else G.copy()), 0
 
     # Map the root node names to their node IDs (which include type prefixes)
+    root_name_set = frozenset(root_node_names)
     specified_root_ids = []
     for root_node in all_root_nodes:
-        node_type = G.nodes[root_node].get("type")
-        if node_type in (NODE_TYPE_IMAGE, NODE_TYPE_OBJECT, NODE_TYPE_MEASUREMENT):
-            # Extract name from node attributes or from the node ID
-            node_name = G.nodes[root_node].get("name")
-            if not node_name and "__" in root_node:
-                node_name = root_node.split("__", 1)[1]
-
-            # Check if this node should be included
-            if node_name in root_node_names:
-                specified_root_ids.append(root_node)
+        attrs = G.nodes[root_node]
+        # Check if this data node should be included; data nodes always carry
+        # their name, so the node ID is not split here
+        if (
+            attrs.get("type") in DATA_NODE_TYPES
+            and _data_node_name(root_node, attrs) in root_name_set
+        ):
+            specified_root_ids.append(root_node)
 
     # If no specified roots were found, return the original graph with a warning
     if not specified_root_ids:
         print("Warning: None of the specified root nodes were found in the graph")
-        return filtered_graph, 0
-
-    # Find all nodes reachable from the specified roots
-    reachable_nodes = set()
+        return (G if inplace else G.copy()), 0
+
+    # Find all nodes reachable from the specified roots with a single
+    # multi-source BFS sharing one visited set, so overlapping reach is
+    # traversed only once
+    succ = G.succ
+    reachable_nodes = set(specified_root_ids)
+    queue = deque(specified_root_ids)
+    while queue:
+        for child in succ[queue.popleft()]:
+            if child not in reachable_nodes:
+                reachable_nodes.add(child)
+                queue.append(child)
+
+    # Add direct parents of the root nodes
     for root_id in specified_root_ids:
-        # Use BFS to find all nodes reachable from this root
-        bfs_tree = nx.bfs_tree(G, root_id)
-        reachable_nodes.update(bfs_tree.nodes())
-        # Add the root itself
-        reachable_nodes.add(root_id)
-
-        # Add direct parents of this root node
-        reachable_nodes.update(G.predecessors(root_id))
+        reachable_nodes.update(G.pred[root_id])
 
     # Get nodes that aren't reachable
     nodes_to_process = [node for node in G.nodes() if node not in reachable_nodes]
 
     if highlight_filtered:
         # Mark nodes as filtered instead of removing them
+        filtered_graph = G if inplace else G.copy()
         for node in nodes_to_process:
             filtered_graph.nodes[node]["filtered"] = True
             # No label change for module nodes, rely on visual styling (color and dashed border)
     else:
         # Remove nodes that aren't reachable
-        filtered_graph.remove_nodes_from(nodes_to_process)
+        filtered_graph = _remove_nodes(G, nodes_to_process, inplace)
 
     return filtered_graph, len(nodes_to_process)
 
 
 def filter_exclude_module_types(
-    G: nx.DiGraph, module_types: List[str], highlight_filtered: bool = False
+    G: nx.DiGraph,
+    module_types: List[str],
+    highlight_filtered: bool = False,
+    inplace: bool = False,
 ) -> Tuple[nx.DiGraph, int]:
     """
     Filter graph to exclude nodes with specified module types.
@@ -1386,30 +1861,29 @@ def filter_exclude_module_types(
         G: The original NetworkX graph
         module_types: List of module type names to exclude
         highlight_filtered: If True, mark filtered nodes instead of removing them
+        inplace: If True, modify G itself instead of a copy
 
     Returns:
         A tuple of (filtered graph, number of nodes affected)
     """
-    # Create a copy of the graph to modify
-    filtered_graph = G.copy()
-
     # Find all module nodes with the specified types
+    module_type_set = frozenset(module_types)
     module_nodes_to_exclude = [
         node
         for node, attrs in G.nodes(data=True)
         if attrs.get("type") == NODE_TYPE_MODULE
-        and attrs.get("module_name") in module_types
+        and attrs.get("module_name") in module_type_set
     ]
 
     if highlight_filtered:
         # Mark nodes as filtered instead of removing them
+        filtered_graph = G if inplace else G.copy()
         for node in module_nodes_to_exclude:
             filtered_graph.nodes[node]["filtered"] = True
             # No label change, just rely on visual styling (color and dashed border)
     else:
         # Remove excluded module nodes
-        if module_nodes_to_exclude:
-            filtered_graph.remove_nodes_from(module_nodes_to_exclude)
+        filtered_graph = _remove_nodes(G, module_nodes_to_exclude, inplace)
 
     return filtered_graph, len(module_nodes_to_exclude)
 
@@ -1420,6 +1894,7 @@ def filter_remove_unused_data(
     filter_images: bool = False,
     filter_objects: bool = False,
     filter_measurements: bool = False,
+    inplace: bool = False,
 ) -> Tuple[nx.DiGraph, int]:
     """
     Filter graph to remove image, object, and/or measurement nodes that are not inputs to any module.
@@ -1430,51 +1905,48 @@ def filter_remove_unused_data(
         filter_images: If true, mark/filter images
         filter_objects: If true, mark/filter objects
         filter_measurements: If true, mark/filter measurements
+        inplace: If True, modify G itself instead of a copy
 
     Returns:
         A tuple of (filtered graph, number of nodes affected)
     """
     if not filter_images and not filter_objects and not filter_measurements:
         return G, 0
-    # Create a copy of the graph to modify
-    filtered_graph = G.copy()
 
-    # Find all image nodes (exclude objects)
-    data_nodes = [
+    data_types = set()
+    if filter_images:
+        data_types.add(NODE_TYPE_IMAGE)
+    if filter_objects:
+        data_types.add(NODE_TYPE_OBJECT)
+    if filter_measurements:
+        data_types.add(NODE_TYPE_MEASUREMENT)
+
+    # Find data nodes of the selected types that are unused (not inputs to
+    # any module), in one pass over the nodes. The graph is bipartite (edges
+    # only connect data nodes and modules), so a data node is unused exactly
+    # when it has no successors.
+    succ = G.succ
+    unused_data = [
         node
         for node, attrs in G.nodes(data=True)
-        if (filter_images and attrs.get("type") == NODE_TYPE_IMAGE)
-        or (filter_objects and attrs.get("type") == NODE_TYPE_OBJECT)
-        or (filter_measurements and attrs.get("type") == NODE_TYPE_MEASUREMENT)
+        if attrs.get("type") in data_types and not succ[node]
     ]
 
-    # Check which ones are unused (not inputs to any module)
-    unused_data = []
-    for node in data_nodes:
-        # Get all successors of this node
-        successors = list(G.successors(node))
-
-        # If there are no successors or none of them are modules, it's unused
-        if not successors or not any(
-            G.nodes[succ].get("type") == NODE_TYPE_MODULE for succ in successors
-        ):
-            unused_data.append(node)
-
     if highlight_filtered:
         # Mark nodes as filtered instead of removing them
+        filtered_graph = G if inplace else G.copy()
         for node in unused_data:
             filtered_graph.nodes[node]["filtered"] = True
             # No label change, rely on visual styling (color and dashed border)
     else:
         # Remove unused data nodes
-        if unused_data:
-            filtered_graph.remove_nodes_from(unused_data)
+        filtered_graph = _remove_nodes(G, unused_data, inplace)
 
     return filtered_graph, len(unused_data)
 
 
 def filter_multiple_parents(
-    G: nx.DiGraph, highlight_filtered: bool = False
+    G: nx.DiGraph, highlight_filtered: bool = False, inplace: bool = False
 ) -> Tuple[nx.DiGraph, int]:
     """
     Ensure images, objects, and measurements only have a single parent.
@@ -1483,11 +1955,12 @@ def filter_multiple_parents(
     Args:
         G: The original NetworkX graph
         highlight_filtered: If True, mark edges as filtered instead of removing them
+        inplace: If True, modify G itself instead of a copy
 
     Returns:
         A tuple of (filtered graph, number of edges affected)
     """
-    filtered_graph = G.copy()
+    filtered_graph = G if inplace else G.copy()
     edges_affected = 0
 
     data_nodes = [
@@ -1533,7 +2006,7 @@ def filter_multiple_parents(
 
 
 def filter_voided_modules(
-    G: nx.DiGraph, highlight_filtered: bool = False
+    G: nx.DiGraph, highlight_filtered: bool = False, inplace: bool = False
 ) -> Tuple[nx.DiGraph, int]:
     """
     Filter graph to remove or mark module nodes that have no inputs and no outputs.
@@ -1541,11 +2014,12 @@ def filter_voided_modules(
     Args:
         G: The original NetworkX graph
         highlight_filtered: If True, mark filtered nodes instead of removing them
+        inplace: If True, modify G itself instead of a copy
 
     Returns:
         A tuple of (filtered graph, number of nodes affected)
     """
-    filtered_graph = G.copy()
+    filtered_graph = G if inplace else G.copy()
 
     # Find all module nodes
     module_nodes = [
@@ -1598,6 +2072,7 @@ def apply_graph_filters(
     highlight_filtered: bool = False,
     quiet: bool = False,
     no_single_parent: bool = False,
+    inplace: bool = False,
 ) -> nx.DiGraph:
     """
     Apply multiple graph filters based on specified parameters.
@@ -1612,12 +2087,25 @@ def apply_graph_filters(
         highlight_filtered: Whether to highlight filtered nodes instead of removing them
         quiet: Whether to suppress filter information output
         no_single_parent: Disable trimming of multiple parents
+        inplace: If True, filter (or highlight) G itself instead of a copy
 
     Returns:
-        A filtered NetworkX DiGraph
-    """
-    # Start with a copy of the original graph
-    filtered_graph = G.copy()
+        A filtered NetworkX DiGraph (a new graph unless inplace is True)
+    """
+    # Nothing to filter: skip the filter setup, copying only if not in place
+    if not (
+        root_nodes
+        or remove_unused_images
+        or remove_unused_objects
+        or remove_unused_measurements
+        or exclude_module_types
+        or not no_single_parent
+    ):
+        return G if inplace else G.copy()
+
+    # Start with a copy of the original graph, unless filtering in place;
+    # every filter then works on this graph in place instead of making its own
+    filtered_graph = G if inplace else G.copy()
     initial_node_count = len(filtered_graph.nodes())  # type: ignore
 
     # Track count of affected nodes
@@ -1631,7 +2119,7 @@ def apply_graph_filters(
                 f"{action_verb} nodes not reachable from root nodes: {', '.join(root_nodes)}"
             )
         filtered_graph, nodes_affected = filter_keep_reachable_from_roots(
-            filtered_graph, root_nodes, highlight_filtered
+            filtered_graph, root_nodes, highlight_filtered, inplace=True
         )
         total_affected += nodes_affected
         if not quiet and nodes_affected > 0:
@@ -1663,6 +2151,7 @@ def apply_graph_filters(
             remove_unused_images,
             remove_unused_objects,
             remove_unused_measurements,
+            inplace=True,
         )
         total_affected += nodes_affected
         if nodes_affected > 0:
@@ -1679,7 +2168,7 @@ def apply_graph_filters(
         if not quiet:
             print(f"{action_verb} modules of types: {', '.join(exclude_module_types)}")
         filtered_graph, nodes_affected = filter_exclude_module_types(
-            filtered_graph, exclude_module_types, highlight_filtered
+            filtered_graph, exclude_module_types, highlight_filtered, inplace=True
         )
         total_affected += nodes_affected
         if not quiet and nodes_affected > 0:
@@ -1699,7 +2188,7 @@ def apply_graph_filters(
         total_voided = 0
         while True:
             filtered_graph, nodes_affected = filter_voided_modules(
-                filtered_graph, highlight_filtered
+                filtered_graph, highlight_filtered, inplace=True
             )
             total_voided += nodes_affected
             if nodes_affected == 0:
@@ -1719,7 +2208,7 @@ def apply_graph_filters(
         if not quiet:
             print(f"{action_verb} edges from multiple parents")
         filtered_graph, edges_affected = filter_multiple_parents(
-            filtered_graph, highlight_filtered
+            filtered_graph, highlight_filtered, inplace=True
         )
         total_affected += edges_affected
         if not quiet and edges_affected > 0:
@@ -1740,6 +2229,50 @@ def apply_graph_filters(
 
 
 # ----- MAIN EXECUTION AND CLI -----
+
+
+@functools.cache
+def _load_click():
+    """
+    Import click on first use so library callers of process_pipeline skip it.
+
+    Returns:
+        The click module
+    """
+    import click
+
+    return click
+
+
+def _cli_error(message: str) -> Exception:
+    """
+    Build a click.ClickException for reporting a user-facing error.
+
+    Args:
+        message: Error message to display
+
+    Returns:
+        A ClickException instance to be raised by the caller
+    """
+    return _load_click().ClickException(message)
+
+
+def _not_pipeline_error(pipeline_path: str) -> Exception:
+    """
+    Build the error for JSON that is not a CellProfiler pipeline.
+
+    Args:
+        pipeline_path: Path to the rejected JSON file
+
+    Returns:
+        A ClickException instance to be raised by the caller
+    """
+    return _cli_error(
+        f"Not a CellProfiler pipeline JSON file: {pipeline_path} "
+        "(use --dependency-graph for dependency graph JSON)"
+    )
+
+
 def process_pipeline(
     pipeline_path: Optional[str],
     output_path: Optional[str] = None,
@@ -1760,6 +2293,9 @@ def process_pipeline(
     rank_ignore_filtered: bool = False,
     track_liveness: bool = False,
     no_single_parent: bool = False,
+    stable_id_algo: str = STABLE_ID_ALGO_SHA256,
+    stream: bool = False,
+    cache_pipeline: bool = False,
 ) -> GraphData:
     """
     Process a CellProfiler pipeline and create a dependency graph.
@@ -1787,6 +2323,10 @@ def process_pipeline(
         rank_ignore_filtered: Whether to ignore filtered nodes when calculating ranks
         track_liveness: Whether to highlight image/object edges based on liveness info (dep graph only)
         no_single_parent: Disable trimming of multiple parents
+        stable_id_algo: Hash algorithm used for stable module IDs
+        stream: Whether to stream pipeline modules from the file with ijson
+        cache_pipeline: Whether to reuse the parsed pipeline JSON across calls while
+            the file is unchanged (for repeated library calls; unused by the CLI)
 
     Returns:
         A tuple of (graph, modules_info) where:
@@ -1797,17 +2337,16 @@ def process_pipeline(
     dependency_data = None
     if dependency_graph_path:
         try:
-            with open(dependency_graph_path, "r") as f:
-                dependency_data = json.load(f)
+            dependency_data = load_json_file(dependency_graph_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
-            raise click.ClickException(f"Error loading dependency JSON file: {e}")
+            raise _cli_error(f"Error loading dependency JSON file: {e}")
 
         # validate dependency data and get pydantic types
         dependency_data = DependencyGraph(**dependency_data)
 
         # validate liveness data
         if track_liveness and not has_liveness_data(dependency_data):
-            raise click.ClickException(
+            raise _cli_error(
                 "Liveness tracking requested but dependency graph contains no liveness data"
             )
 
@@ -1821,27 +2360,50 @@ def process_pipeline(
         G, modules_info = create_dependency_graph_from_modules(
             modules_info,
             include_disabled=include_disabled,
+            stable_id_algo=stable_id_algo,
         )
 
     elif pipeline_path:
-        # Load the pipeline JSON
-        try:
-            with open(pipeline_path, "r") as f:
-                pipeline = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            raise click.ClickException(f"Error loading pipeline file: {e}")
-
-        # Create the graph
-        G, modules_info = create_dependency_graph(
-            pipeline,
-            include_disabled=include_disabled,
-        )
+        if stream:
+            try:
+                ijson = _load_ijson()
+            except ImportError:
+                raise _cli_error("--stream requires the ijson package")
+
+            # Parse, check and process modules one at a time while the file is open
+            try:
+                with open(pipeline_path, "rb") as f:
+                    G, modules_info = create_dependency_graph_from_pipeline_modules(
+                        _stream_pipeline_modules(f, pipeline_path),
+                        include_disabled=include_disabled,
+                        stable_id_algo=stable_id_algo,
+                    )
+            except (FileNotFoundError, ijson.JSONError) as e:
+                raise _cli_error(f"Error loading pipeline file: {e}")
+        else:
+            # Load the pipeline JSON
+            try:
+                pipeline = load_pipeline_json(pipeline_path, cache=cache_pipeline)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                raise _cli_error(f"Error loading pipeline file: {e}")
+
+            # Reject JSON that is not a pipeline (e.g. a dependency graph
+            # passed without --dependency-graph) instead of writing an empty graph
+            if not _is_pipeline_json(pipeline):
+                raise _not_pipeline_error(pipeline_path)
+
+            # Create the graph
+            G, modules_info = create_dependency_graph(
+                pipeline,
+                include_disabled=include_disabled,
+                stable_id_algo=stable_id_algo,
+            )
 
         # Make special adjustments for LoadData module
-        G, modules_info = adjust_load_data(modules_info, G)
+        G, modules_info = adjust_load_data(modules_info, G, stable_id_algo)
 
     else:
-        raise click.ClickException("Must provide either pipeline or dependy graph json")
+        raise _cli_error("Must provide either pipeline or dependy graph json")
 
     # Apply filters
     G = apply_graph_filters(
@@ -1854,6 +2416,7 @@ def process_pipeline(
         highlight_filtered=highlight_filtered,
         quiet=quiet,
         no_single_parent=no_single_parent,
+        inplace=True,
     )
 
     # Print information about the pipeline if not quiet
@@ -1875,14 +2438,8 @@ def process_pipeline(
         if track_liveness and dependency_data and not no_formatting:
             apply_liveness_styling(G, dependency_data)
 
-        # If no_module_info is True, simplify edges
-        if no_module_info:
-            for edge in G.edges():
-                # Remove any edge labels
-                if "label" in G.edges[edge]:
-                    del G.edges[edge]["label"]
-
         # Write the graph to the specified file
+        # If no_module_info is True, simplify edges by removing any edge labels
         write_graph_to_file(
             G,
             output_path,
@@ -1890,249 +2447,420 @@ def process_pipeline(
             rank_nodes=rank_nodes,
             rank_ignore_filtered=rank_ignore_filtered,
             quiet=quiet,
+            drop_edge_keys=("label",) if no_module_info else (),
         )
 
     return G, modules_info
 
 
-@click.command(context_settings={"help_option_names": ["-h", "--help"]})
-@click.argument(
-    "pipeline-or-dep-graph", type=click.Path(exists=True, dir_okay=False, readable=True)
-)
-@click.argument(
-    "output", type=click.Path(dir_okay=False, writable=True), required=False
-)
-@click.option(
-    "--dependency-graph",
-    is_flag=True,
-    help="process JSON argument as cp5-style dependency graph rather than pipeline",
-)
-# Display options
-@click.option(
-    "--no-module-info", is_flag=True, help="Hide module information on graph edges"
-)
-@click.option(
-    "--no-formatting", is_flag=True, help="Strip formatting (colors, shapes, etc.)"
-)
-@click.option(
-    "--ultra-minimal",
-    is_flag=True,
-    help="Create minimal output for exact diff comparison",
-)
-@click.option(
-    "--explain-ids", is_flag=True, help="Print mapping of stable IDs to module numbers"
-)
-@click.option(
-    "--rank-nodes",
-    is_flag=True,
-    help="Position source nodes at top and sink nodes at bottom in DOT output",
-)
-@click.option(
-    "--rank-ignore-filtered",
-    is_flag=True,
-    help="Ignore filtered nodes when positioning source and sink nodes",
-)
-@click.option(
-    "--track-liveness",
-    is_flag=True,
-    help="Color edges based on liveness data (green=live, red=disposed). Requires --dependency-graph with liveness data.",
-)
-# Content filtering options
-@click.option(
-    "--include-disabled", is_flag=True, help="Include disabled modules in the graph"
-)
-@click.option(
-    "--root-nodes",
-    help="Comma-separated list of root node names to filter the graph by",
-)
-@click.option(
-    "--remove-unused-images",
-    is_flag=True,
-    help="Remove image nodes not used as inputs",
-)
-@click.option(
-    "--remove-unused-objects",
-    is_flag=True,
-    help="Remove object nodes not used as inputs",
-)
-@click.option(
-    "--remove-unused-measurements",
-    is_flag=True,
-    help="Remove measurement nodes not used as inputs",
-)
-@click.option(
-    "--highlight-filtered",
-    is_flag=True,
-    help="Highlight filtered nodes instead of removing them",
-)
-@click.option(
-    "--exclude-module-types",
-    help="Comma-separated list of module types to exclude (e.g., ExportToSpreadsheet)",
-)
-@click.option(
-    "--no-single-parent",
-    is_flag=True,
-    help="Allow images and objects to have more than one parent",
-)
-# Validation options (for dependency graph only)
-@click.option(
-    "--validate-only",
-    is_flag=True,
-    help="Only validate dependency graph against schema (requires --dependency-graph)",
-)
-@click.option(
-    "--summary",
-    is_flag=True,
-    help="Print dependency graph summary (use with --validate-only or --dependency-graph)",
-)
-# Output options
-@click.option("--quiet", "-q", is_flag=True, help="Suppress informational output")
-def cli(
-    pipeline_or_dep_graph: str,
-    output: Optional[str],
-    dependency_graph: bool,
-    no_module_info: bool,
-    no_formatting: bool,
-    ultra_minimal: bool,
-    explain_ids: bool,
-    rank_nodes: bool,
-    rank_ignore_filtered: bool,
-    track_liveness: bool,
-    include_disabled: bool,
-    root_nodes: Optional[str],
-    remove_unused_images: bool,
-    remove_unused_objects: bool,
-    remove_unused_measurements: bool,
-    highlight_filtered: bool,
-    exclude_module_types: Optional[str],
-    no_single_parent: bool,
-    validate_only: bool,
-    summary: bool,
-    quiet: bool,
-) -> None:
+def _process_pipeline_job(job: Tuple[str, str, Dict[str, Any]]) -> Optional[str]:
     """
-    Create a graph representation of a CellProfiler pipeline.
+    Process one pipeline of a batch, reporting failure as a message.
 
-    PIPELINE: Path to the CellProfiler pipeline JSON file
+    Errors are returned rather than raised so one bad pipeline does not stop
+    the rest of the batch.
 
-    OUTPUT: Optional path for output graph file (.graphml, .gexf, or .dot)
+    Args:
+        job: Tuple of (pipeline path, output path, process_pipeline keyword arguments)
 
-    For detailed examples, see README.md
+    Returns:
+        None on success, otherwise the error message
     """
-    # Process root nodes if provided
-    root_node_list = None
-    if root_nodes:
-        root_node_list = [
-            name.strip() for name in root_nodes.split(",") if name.strip()
-        ]
+    pipeline_path, output_path, options = job
+    click = _load_click()
+    try:
+        process_pipeline(pipeline_path, output_path, **options)
+    # Only expected I/O and input errors are reported per pipeline; unexpected
+    # bugs still propagate with their traceback
+    except (OSError, ValueError, click.ClickException) as e:
+        return str(e)
+    return None
 
-    # Process module types to exclude if provided
-    exclude_module_types_list = None
-    if exclude_module_types:
-        exclude_module_types_list = [
-            name.strip() for name in exclude_module_types.split(",") if name.strip()
-        ]
-    if dependency_graph:
-        dependency_graph_path = pipeline_or_dep_graph
-        pipeline_path = None
+
+def process_pipeline_directory(
+    pipeline_dir: str,
+    output_dir: str,
+    output_format: str = "graphml",
+    jobs: int = 1,
+    **options: Any,
+) -> Dict[str, Optional[str]]:
+    """
+    Process every pipeline JSON file in a directory, optionally in parallel.
+
+    Each pipeline is written to output_dir under its own name with the given
+    format's extension. Per-pipeline output is suppressed (quiet=True). JSON
+    files that are not pipelines (e.g. dependency graphs) are reported as errors.
+
+    Args:
+        pipeline_dir: Directory containing CellProfiler pipeline JSON files
+        output_dir: Directory for the output graph files (created if missing)
+        output_format: Output file extension without the dot (graphml, gexf, or dot)
+        jobs: Number of worker processes; 1 runs in this process, 0 uses all CPUs
+        **options: Additional keyword arguments passed to process_pipeline
+
+    Returns:
+        Dictionary mapping each output path to None on success or an error message
+    """
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    options["quiet"] = True
+    job_list = [
+        (str(path), str(out_dir / f"{path.stem}.{output_format}"), options)
+        for path in sorted(Path(pipeline_dir).glob("*.json"))
+    ]
+
+    if jobs == 1:
+        errors = list(map(_process_pipeline_job, job_list))
     else:
-        pipeline_path = pipeline_or_dep_graph
-        dependency_graph_path = None
+        from concurrent.futures import ProcessPoolExecutor
 
-    # Handle validation-only mode for dependency graphs
-    if validate_only:
-        if not dependency_graph:
-            raise click.ClickException(
-                "--validate-only requires --dependency-graph flag"
-            )
+        with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+            errors = list(executor.map(_process_pipeline_job, job_list))
 
-        try:
-            with open(dependency_graph_path, "r") as f:  # type: ignore
-                dependency_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            raise click.ClickException(f"Error loading dependency graph: {e}")
+    return {output_path: error for (_, output_path, _), error in zip(job_list, errors)}
 
-        # Validate using Pydantic
-        is_valid, message, validated_graph = validate_dependency_graph_with_pydantic(
-            dependency_data
-        )
 
-        # Print validation result
-        click.echo(message)
+def _build_cli():
+    """
+    Import click and build the command-line interface.
+
+    Returns:
+        The click command for the cp_graph CLI
+    """
+    click = _load_click()
+
+    @click.command(context_settings={"help_option_names": ["-h", "--help"]})
+    @click.argument(
+        "pipeline-or-dep-graph",
+        type=click.Path(exists=True, readable=True),
+    )
+    @click.argument("output", type=click.Path(writable=True), required=False)
+    @click.option(
+        "--dependency-graph",
+        is_flag=True,
+        help="process JSON argument as cp5-style dependency graph rather than pipeline",
+    )
+    # Display options
+    @click.option(
+        "--no-module-info", is_flag=True, help="Hide module information on graph edges"
+    )
+    @click.option(
+        "--no-formatting", is_flag=True, help="Strip formatting (colors, shapes, etc.)"
+    )
+    @click.option(
+        "--ultra-minimal",
+        is_flag=True,
+        help="Create minimal output for exact diff comparison",
+    )
+    @click.option(
+        "--explain-ids",
+        is_flag=True,
+        help="Print mapping of stable IDs to module numbers",
+    )
+    @click.option(
+        "--stable-id-algo",
+        type=click.Choice(STABLE_ID_ALGOS, case_sensitive=False),
+        default=STABLE_ID_ALGO_SHA256,
+        show_default=True,
+        help="Hash algorithm for stable module IDs (blake2b is faster but changes IDs)",
+    )
+    @click.option(
+        "--rank-nodes",
+        is_flag=True,
+        help="Position source nodes at top and sink nodes at bottom in DOT output",
+    )
+    @click.option(
+        "--rank-ignore-filtered",
+        is_flag=True,
+        help="Ignore filtered nodes when positioning source and sink nodes",
+    )
+    @click.option(
+        "--track-liveness",
+        is_flag=True,
+        help="Color edges based on liveness data (green=live, red=disposed). Requires --dependency-graph with liveness data.",
+    )
+    # Content filtering options
+    @click.option(
+        "--include-disabled", is_flag=True, help="Include disabled modules in the graph"
+    )
+    @click.option(
+        "--root-nodes",
+        help="Comma-separated list of root node names to filter the graph by",
+    )
+    @click.option(
+        "--remove-unused-images",
+        is_flag=True,
+        help="Remove image nodes not used as inputs",
+    )
+    @click.option(
+        "--remove-unused-objects",
+        is_flag=True,
+        help="Remove object nodes not used as inputs",
+    )
+    @click.option(
+        "--remove-unused-measurements",
+        is_flag=True,
+        help="Remove measurement nodes not used as inputs",
+    )
+    @click.option(
+        "--highlight-filtered",
+        is_flag=True,
+        help="Highlight filtered nodes instead of removing them",
+    )
+    @click.option(
+        "--exclude-module-types",
+        help="Comma-separated list of module types to exclude (e.g., ExportToSpreadsheet)",
+    )
+    @click.option(
+        "--no-single-parent",
+        is_flag=True,
+        help="Allow images and objects to have more than one parent",
+    )
+    # Validation options (for dependency graph only)
+    @click.option(
+        "--validate-only",
+        is_flag=True,
+        help="Only validate dependency graph against schema (requires --dependency-graph)",
+    )
+    @click.option(
+        "--summary",
+        is_flag=True,
+        help="Print dependency graph summary (use with --validate-only or --dependency-graph)",
+    )
+    # Output options
+    @click.option(
+        "--stream",
+        is_flag=True,
+        help="Stream pipeline modules from the JSON file instead of loading it whole (requires ijson)",
+    )
+    # Batch options (when PIPELINE is a directory)
+    @click.option(
+        "--jobs",
+        "-j",
+        type=click.IntRange(min=0),
+        default=1,
+        show_default=True,
+        help="Number of pipelines to process in parallel for directory input (0 = all CPUs)",
+    )
+    @click.option(
+        "--output-format",
+        type=click.Choice(["graphml", "gexf", "dot"], case_sensitive=False),
+        default="graphml",
+        show_default=True,
+        help="Output format for directory input",
+    )
+    @click.option("--quiet", "-q", is_flag=True, help="Suppress informational output")
+    def cli(
+        pipeline_or_dep_graph: str,
+        output: Optional[str],
+        dependency_graph: bool,
+        no_module_info: bool,
+        no_formatting: bool,
+        ultra_minimal: bool,
+        explain_ids: bool,
+        stable_id_algo: str,
+        rank_nodes: bool,
+        rank_ignore_filtered: bool,
+        track_liveness: bool,
+        include_disabled: bool,
+        root_nodes: Optional[str],
+        remove_unused_images: bool,
+        remove_unused_objects: bool,
+        remove_unused_measurements: bool,
+        highlight_filtered: bool,
+        exclude_module_types: Optional[str],
+        no_single_parent: bool,
+        validate_only: bool,
+        summary: bool,
+        stream: bool,
+        jobs: int,
+        output_format: str,
+        quiet: bool,
+    ) -> None:
+        """
+        Create a graph representation of a CellProfiler pipeline.
+
+        PIPELINE: Path to the CellProfiler pipeline JSON file, or a directory of
+        pipeline JSON files to process in batch
+
+        OUTPUT: Optional path for output graph file (.graphml, .gexf, or .dot),
+        or the output directory when PIPELINE is a directory
+
+        For detailed examples, see README.md
+        """
+        # Process root nodes if provided
+        root_node_list = None
+        if root_nodes:
+            root_node_list = [
+                name for name in LIST_VALUE_SEPARATOR.split(root_nodes.strip()) if name
+            ]
+
+        # Process module types to exclude if provided
+        exclude_module_types_list = None
+        if exclude_module_types:
+            exclude_module_types_list = [
+                name
+                for name in LIST_VALUE_SEPARATOR.split(exclude_module_types.strip())
+                if name
+            ]
+        if Path(pipeline_or_dep_graph).is_dir():
+            if dependency_graph or validate_only:
+                raise click.ClickException(
+                    "Directory input is only supported for pipeline files"
+                )
+            if explain_ids or track_liveness:
+                raise click.ClickException(
+                    "--explain-ids and --track-liveness are not supported for directory input"
+                )
+            if not output:
+                raise click.ClickException(
+                    "Output directory required for directory input"
+                )
+            if Path(output).exists() and not Path(output).is_dir():
+                raise click.ClickException(
+                    f"Output must be a directory for directory input: {output}"
+                )
 
-        # Print summary if requested and validation passed
-        if summary and is_valid and validated_graph:
-            click.echo()
-            click.echo(validated_graph.summary())
+            results = process_pipeline_directory(
+                pipeline_or_dep_graph,
+                output,
+                output_format=output_format,
+                jobs=jobs,
+                no_module_info=no_module_info,
+                include_disabled=include_disabled,
+                no_formatting=no_formatting,
+                ultra_minimal=ultra_minimal,
+                root_nodes=root_node_list,
+                remove_unused_images=remove_unused_images,
+                remove_unused_objects=remove_unused_objects,
+                remove_unused_measurements=remove_unused_measurements,
+                highlight_filtered=highlight_filtered,
+                exclude_module_types=exclude_module_types_list,
+                rank_nodes=rank_nodes,
+                rank_ignore_filtered=rank_ignore_filtered,
+                no_single_parent=no_single_parent,
+                stable_id_algo=stable_id_algo,
+                stream=stream,
+            )
+            failed = 0
+            for output_path, error in results.items():
+                if error is None:
+                    if not quiet:
+                        click.echo(f"Graph saved to: {output_path}")
+                else:
+                    failed += 1
+                    click.echo(f"Error: {output_path}: {error}", err=True)
+            sys.exit(1 if failed else 0)
 
-        # Exit with appropriate code
-        sys.exit(0 if is_valid else 1)
+        if dependency_graph:
+            dependency_graph_path = pipeline_or_dep_graph
+            pipeline_path = None
+        else:
+            pipeline_path = pipeline_or_dep_graph
+            dependency_graph_path = None
+
+        # Handle validation-only mode for dependency graphs
+        if validate_only:
+            if not dependency_graph:
+                raise click.ClickException(
+                    "--validate-only requires --dependency-graph flag"
+                )
 
-    # Validate before processing if requested
-    if dependency_graph and summary and not validate_only:
-        try:
-            with open(dependency_graph_path, "r") as f:  # type: ignore
-                dependency_data = json.load(f)
+            try:
+                dependency_data = load_json_file(dependency_graph_path)  # type: ignore
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                raise click.ClickException(f"Error loading dependency graph: {e}")
 
-            # Validate and show summary if successful
+            # Validate using Pydantic
             is_valid, message, validated_graph = (
                 validate_dependency_graph_with_pydantic(dependency_data)
             )
 
-            is_valid = is_valid and (
-                not track_liveness or has_liveness_data(dependency_data)
-            )
-
-            if not quiet:
-                click.echo(message)
+            # Print validation result
+            click.echo(message)
 
-            if is_valid and validated_graph and not quiet:
+            # Print summary if requested and validation passed
+            if summary and is_valid and validated_graph:
                 click.echo()
                 click.echo(validated_graph.summary())
-                click.echo()
-        except Exception as e:
-            if not quiet:
-                click.echo(f"Warning: Could not validate/summarize: {e}", err=True)
 
-    if not dependency_graph and track_liveness:
-        raise click.ClickException(
-            "--track-liveness can only be used with --dependency-graph"
-        )
+            # Exit with appropriate code
+            sys.exit(0 if is_valid else 1)
 
-    # Check output file is provided for processing
-    if not output:
-        raise click.ClickException("Output file required unless using --validate-only")
+        # Validate before processing if requested
+        if dependency_graph and summary and not validate_only:
+            try:
+                dependency_data = load_json_file(dependency_graph_path)  # type: ignore
 
-    try:
-        # Run the main processing function
-        process_pipeline(
-            pipeline_path,
-            output,
-            dependency_graph_path,
-            no_module_info,
-            include_disabled,
-            no_formatting,
-            ultra_minimal,
-            explain_ids=explain_ids,
-            quiet=quiet,
-            root_nodes=root_node_list,
-            remove_unused_images=remove_unused_images,
-            remove_unused_objects=remove_unused_objects,
-            remove_unused_measurements=remove_unused_measurements,
-            highlight_filtered=highlight_filtered,
-            exclude_module_types=exclude_module_types_list,
-            rank_nodes=rank_nodes,
-            rank_ignore_filtered=rank_ignore_filtered,
-            track_liveness=track_liveness,
-            no_single_parent=no_single_parent,
-        )
-    except click.ClickException as e:
-        e.show()
-        sys.exit(1)
-    except Exception as e:
-        click.echo(f"Error: {str(e)}", err=True)
-        sys.exit(1)
+                # Validate and show summary if successful
+                is_valid, message, validated_graph = (
+                    validate_dependency_graph_with_pydantic(dependency_data)
+                )
+
+                is_valid = is_valid and (
+                    not track_liveness or has_liveness_data(dependency_data)
+                )
+
+                if not quiet:
+                    click.echo(message)
+
+                if is_valid and validated_graph and not quiet:
+                    click.echo()
+                    click.echo(validated_graph.summary())
+                    click.echo()
+            except Exception as e:
+                if not quiet:
+                    click.echo(f"Warning: Could not validate/summarize: {e}", err=True)
+
+        if not dependency_graph and track_liveness:
+            raise click.ClickException(
+                "--track-liveness can only be used with --dependency-graph"
+            )
+
+        # Check output file is provided for processing
+        if not output:
+            raise click.ClickException(
+                "Output file required unless using --validate-only"
+            )
+        if Path(output).is_dir():
+            raise click.ClickException(
+                f"Output must be a file, not a directory: {output}"
+            )
+
+        try:
+            # Run the main processing function
+            process_pipeline(
+                pipeline_path,
+                output,
+                dependency_graph_path,
+                no_module_info,
+                include_disabled,
+                no_formatting,
+                ultra_minimal,
+                explain_ids=explain_ids,
+                quiet=quiet,
+                root_nodes=root_node_list,
+                remove_unused_images=remove_unused_images,
+                remove_unused_objects=remove_unused_objects,
+                remove_unused_measurements=remove_unused_measurements,
+                highlight_filtered=highlight_filtered,
+                exclude_module_types=exclude_module_types_list,
+                rank_nodes=rank_nodes,
+                rank_ignore_filtered=rank_ignore_filtered,
+                track_liveness=track_liveness,
+                no_single_parent=no_single_parent,
+                stable_id_algo=stable_id_algo,
+                stream=stream,
+            )
+        # ClickExceptions are reported by click itself; only expected I/O and
+        # input errors are caught here so unexpected bugs keep their traceback
+        except (OSError, ValueError) as e:
+            click.echo(f"Error: {str(e)}", err=True)
+            sys.exit(1)
+
+    return cli
 
 
 if __name__ == "__main__":
-    cli()
+    _build_cli()()
@@ -35,6 +35,18 @@ pixi exec --spec "graphviz" dot -Tpng examples/output/illum_filtered.dot -o exam
 ./cp_graph.py examples/illum.json examples/output/illum_ultra.dot --ultra-minimal
 ./cp_graph.py examples/illum_isoform.json examples/output/illum_isoform_ultra.dot --ultra-minimal
 ./cp_graph.py examples/illum_mod.json examples/output/illum_mod_ultra.dot --ultra-minimal
+./cp_graph.py examples/illum_spaces.json examples/output/illum_spaces_ultra.dot --ultra-minimal
+
+# BLAKE2b stable IDs
+./cp_graph.py examples/illum.json examples/output/illum_blake2b.dot --stable-id-algo blake2b
+
+# Batch conversion of a directory with parallel jobs
+batch_dir=$(mktemp -d)
+trap 'rm -rf "$batch_dir"' EXIT
+mkdir "$batch_dir/in" "$batch_dir/out"
+cp examples/illum.json examples/illum_mod.json "$batch_dir/in"
+./cp_graph.py "$batch_dir/in" "$batch_dir/out" -j 2 --output-format dot --ultra-minimal -q
+cat "$batch_dir/out/illum.dot" "$batch_dir/out/illum_mod.dot" > examples/output/batch_ultra.dot
 
 # # Additional examples from Advanced Usage section
 # # These are not rendered in the documentation, but are mentioned in the README.md as examples.
@@ -113,5 +125,9 @@ pixi exec --spec "graphviz" dot -Tpng examples/output/ExampleFly-measurement.dot
   examples/ExampleFlyMeas-liveness-dep.json examples/output/ExampleFly-liveness.dot
 pixi exec --spec "graphviz" dot -Tpng examples/output/ExampleFly-liveness.dot -o examples/output/ExampleFly-liveness.png
 
+# Dependency graph JSON streamed as a pipeline is rejected (error message kept for tests)
+! ./cp_graph.py --stream examples/ExampleFly-dep-graph.json /dev/null -q \
+  2> examples/output/ExampleFly-dep-graph-stream-error.txt
+
 echo "Done! All example outputs have been regenerated."
 echo "Files created in: examples/output/"
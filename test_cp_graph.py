@@ -111,17 +111,41 @@ def main():
             "./cp_graph.py examples/illum_mod.json examples/output/illum_mod_ultra.dot --ultra-minimal",
             Path("examples/output/illum_mod_ultra.dot"),
         ),
+        (
+            "Illum ultra-minimal with spaces in names (quoted IDs)",
+            "./cp_graph.py examples/illum_spaces.json examples/output/illum_spaces_ultra.dot --ultra-minimal",
+            Path("examples/output/illum_spaces_ultra.dot"),
+        ),
+        (
+            "Illum with BLAKE2b stable IDs",
+            "./cp_graph.py examples/illum.json examples/output/illum_blake2b.dot --stable-id-algo blake2b",
+            Path("examples/output/illum_blake2b.dot"),
+        ),
         # Complex Analysis Pipeline
         (
             "Basic analysis graph",
             "./cp_graph.py examples/analysis.json examples/output/analysis.dot",
             Path("examples/output/analysis.dot"),
         ),
+        (
+            "Analysis streamed (same output as loading whole file)",
+            "./cp_graph.py examples/analysis.json examples/output/analysis.dot --stream",
+            Path("examples/output/analysis.dot"),
+        ),
         (
             "Analysis filtered (complex)",
             "./cp_graph.py examples/analysis.json examples/output/analysis_filtered.dot --rank-nodes --remove-unused-images --exclude-module-types=ExportToSpreadsheet --highlight-filtered --rank-ignore-filtered --root-nodes=CorrPhalloidin,CorrZO1,CorrDNA,Cycle01_DAPI,Cycle01_A,Cycle01_T,Cycle01_G,Cycle01_C,Cycle02_DAPI,Cycle02_A,Cycle02_T,Cycle02_G,Cycle02_C,Cycle03_DAPI,Cycle03_A,Cycle03_T,Cycle03_G,Cycle03_C",
             Path("examples/output/analysis_filtered.dot"),
         ),
+        # Batch conversion of a directory into an existing output directory
+        (
+            "Batch ultra-minimal with parallel jobs",
+            "d=$(mktemp -d) && trap 'rm -rf \"$d\"' EXIT && mkdir $d/in $d/out"
+            " && cp examples/illum.json examples/illum_mod.json $d/in"
+            " && ./cp_graph.py $d/in $d/out -j 2 --output-format dot --ultra-minimal -q"
+            " && cat $d/out/illum.dot $d/out/illum_mod.dot > examples/output/batch_ultra.dot",
+            Path("examples/output/batch_ultra.dot"),
+        ),
         # CellProfiler 5 Dependency Graphs
         (
             "ExampleFly basic",
@@ -138,6 +162,11 @@ def main():
             "./cp_graph.py --dependency-graph --remove-unused-measurements --track-liveness --rank-nodes examples/ExampleFlyMeas-liveness-dep.json examples/output/ExampleFly-liveness.dot",
             Path("examples/output/ExampleFly-liveness.dot"),
         ),
+        (
+            "ExampleFly dependency graph streamed as a pipeline (rejected)",
+            "! ./cp_graph.py --stream examples/ExampleFly-dep-graph.json /dev/null -q 2> examples/output/ExampleFly-dep-graph-stream-error.txt",
+            Path("examples/output/ExampleFly-dep-graph-stream-error.txt"),
+        ),
     ]
 
     # Track results